@@ -1,17 +1,27 @@
 """
 Root conftest.py for pytest configuration and shared fixtures.
 """
+import math
 import os
+import sys
+import httpx
 import pytest
-from typing import Generator
+from typing import AsyncGenerator, Generator
 from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import StaticPool
 from fastapi.testclient import TestClient
 
+# Tests run on in-memory SQLite and deselect those marked ``postgres``. To run
+# against PostgreSQL, opt in with TEST_DATABASE_URL pointing at a disposable
+# database; DATABASE_URL is never used, so an app database can't be picked up.
+_TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL", "")
+if not _TEST_DATABASE_URL.startswith("postgresql"):
+    _TEST_DATABASE_URL = "sqlite:///:memory:"
+
 # Set test environment BEFORE importing any app code
 os.environ["ENV"] = "test"
-os.environ["DATABASE_URL"] = "sqlite:///:memory:"
+os.environ["DATABASE_URL"] = _TEST_DATABASE_URL
 os.environ["TESTING"] = "true"
 
 # Disable background workers that interfere with SQLite tests
@@ -21,11 +31,30 @@ os.environ["RETENTION_ENABLED"] = "false"
 
 # Disable rate limiting for tests (prevents 429 errors in full suite)
 os.environ["RATE_LIMIT_ENABLED"] = "false"
+# The per-process sliding window in add_prometheus ignores RATE_LIMIT_ENABLED and
+# the session-scoped app keeps its window across tests, so raise its ceiling too
+os.environ["RATE_LIMIT_PER_MIN"] = "1000000"
 
 # Set JWT secret for auth tests (32+ chars required)
 os.environ["JWT_SECRET_KEY"] = "test_secret_key_for_testing_purposes_only_do_not_use_in_production"
 
 
+def _is_postgres() -> bool:
+    return _TEST_DATABASE_URL.startswith("postgresql")
+
+
+def pytest_collection_modifyitems(config, items):
+    """Deselect PostgreSQL-only tests instead of collecting them as skips."""
+    if _is_postgres():
+        return
+    selected = [item for item in items if "postgres" not in item.keywords]
+    if len(selected) != len(items):
+        config.hook.pytest_deselected(
+            items=[item for item in items if "postgres" in item.keywords]
+        )
+        items[:] = selected
+
+
 @pytest.fixture(scope="session", autouse=True)
 def clear_settings_cache():
     """Clear settings cache before tests to ensure environment variables are used."""
@@ -36,12 +65,69 @@ def clear_settings_cache():
     get_settings.cache_clear()
 
 
-@pytest.fixture(scope="function")
+def _plain_json(obj) -> bool:
+    """True if ``obj`` holds only types that orjson and stdlib json encode alike.
+
+    orjson writes NaN/Infinity as null and accepts datetimes, dataclasses, UUIDs
+    and enums, where httpx's stdlib call (``allow_nan=False``) raises; anything
+    outside plain JSON types must go through stdlib to keep those errors.
+    """
+    if obj is None or type(obj) in (str, int, bool):
+        return True
+    if type(obj) is float:
+        return math.isfinite(obj)
+    if type(obj) in (list, tuple):
+        return all(_plain_json(item) for item in obj)
+    if type(obj) is dict:
+        return all(type(k) is str and _plain_json(v) for k, v in obj.items())
+    return False
+
+
+@pytest.fixture(scope="session", autouse=True)
+def fast_json_bodies():
+    """Encode plain ``client.post(json=...)`` bodies with orjson when it's installed."""
+    try:
+        import httpx._content as httpx_content
+        import orjson
+    except ImportError:
+        yield
+        return
+    if not hasattr(httpx_content, "json_dumps"):
+        yield
+        return
+
+    stdlib_dumps = httpx_content.json_dumps
+    # What httpx.encode_json passes; orjson's compact UTF-8 output matches it
+    httpx_options = {
+        "ensure_ascii": False,
+        "separators": (",", ":"),
+        "allow_nan": False,
+    }
+
+    def json_dumps(obj, **kwargs):
+        if kwargs == httpx_options and _plain_json(obj):
+            try:
+                return orjson.dumps(obj).decode()
+            except orjson.JSONEncodeError:
+                pass  # e.g. integers beyond 64 bits; stdlib handles those
+        return stdlib_dumps(obj, **kwargs)
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(httpx_content, "json_dumps", json_dumps)
+        yield
+
+
+@pytest.fixture(scope="module")
 def test_db_engine():
     """
-    Create a test database engine using SQLite in-memory.
-    Function-scoped so each test gets a fresh, isolated database.
-    This eliminates cross-test contamination issues.
+    Create the test database engine: in-memory SQLite, or PostgreSQL when
+    TEST_DATABASE_URL opts in (see _TEST_DATABASE_URL).
+    Module-scoped so the schema is created once per test file; each test still
+    runs inside db_session's outer transaction, which is rolled back at teardown,
+    so no rows leak between tests.
+    An in-memory database is private to its process, so every pytest-xdist
+    worker (``pytest -n auto``) already gets its own copy of the schema; a
+    PostgreSQL database is shared, so run that suite without ``-n``.
     """
     from services.gateway.app.db import Base
     # Import all models so they're registered with Base.metadata
@@ -55,6 +141,16 @@ def test_db_engine():
     from services.gateway.app.models.onboarding import OnboardingPlan, OnboardingTask
     from services.gateway.app.models.okr import Objective, KeyResult
 
+    if _is_postgres():
+        # Real savepoints, so db_session's rollback isolates tests as-is. The
+        # database came from the environment, so only ever add missing tables;
+        # never drop_all it.
+        engine = create_engine(_TEST_DATABASE_URL, pool_pre_ping=True)
+        Base.metadata.create_all(engine)
+        yield engine
+        engine.dispose()
+        return
+
     # Use in-memory SQLite for tests (fast and isolated)
     engine = create_engine(
         "sqlite:///:memory:",
@@ -63,6 +159,23 @@ def test_db_engine():
         echo=False,
     )
 
+    # pysqlite defers BEGIN until the first write and never issues it for
+    # SAVEPOINT, so db_session's outer rollback would not undo committed
+    # savepoints. Take over transaction control so the rollback really
+    # discards each test's rows (SQLAlchemy's documented pysqlite recipe).
+    # StaticPool hands every checkout the same DBAPI connection, so a second
+    # Connection (e.g. check_database_health) joins the open transaction
+    # instead of issuing a nested BEGIN; closing it still rolls that
+    # transaction back, so don't rely on rows written before hitting /health.
+    @event.listens_for(engine, "connect")
+    def _disable_pysqlite_begin(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _emit_begin(conn):
+        if not conn.connection.dbapi_connection.in_transaction:
+            conn.exec_driver_sql("BEGIN")
+
     # Create all tables
     Base.metadata.create_all(engine)
 
@@ -118,21 +231,50 @@ def db_session(test_db_engine) -> Generator[Session, None, None]:
     connection.close()
 
 
+@pytest.fixture(scope="session")
+def gateway_app():
+    """
+    Build the FastAPI app once per session.
+
+    Router registration and middleware setup are the expensive part of
+    create_app(); per-test state lives in dependency_overrides and the
+    db module globals, which the client fixture swaps and restores.
+    """
+    # Must import here to ensure test environment is set
+    from services.gateway.app.main import create_app  # Import factory, not global app
+
+    return create_app()
+
+
+@pytest.fixture(scope="session")
+def gateway_client(gateway_app) -> Generator[TestClient, None, None]:
+    """
+    Open one TestClient (and run app startup/shutdown once) per session.
+
+    Use the function-scoped ``client`` fixture in tests; it points this
+    client at the test's database before handing it out.
+    """
+    with TestClient(gateway_app) as test_client:
+        yield test_client
+
+
 @pytest.fixture(scope="function")
-def client(test_db_engine, db_session: Session) -> Generator[TestClient, None, None]:
+def client(
+    gateway_app, gateway_client, test_db_engine, db_session: Session
+) -> Generator[TestClient, None, None]:
     """
     Create a FastAPI test client with database overrides.
 
+    The client itself is shared across the session; only the database wiring
+    is per test, so each test still sees its own savepoint-isolated session.
+
     IMPORTANT: All app code must use the test's db_session (with savepoint rollback)
     rather than creating new sessions that commit permanently.
     """
-    # Must import here to ensure test environment is set
     import services.gateway.app.db as db_module
-    from services.gateway.app.main import create_app  # Import factory, not global app
     from services.gateway.app.api.deps import get_db_session
 
-    # Create a fresh app for this test with current settings
-    app = create_app()
+    app = gateway_app
 
     # Override the global engine and sessionmaker
     original_engine = db_module._engine
@@ -176,8 +318,9 @@ def client(test_db_engine, db_session: Session) -> Generator[TestClient, None, N
 
     app.dependency_overrides[get_db_session] = override_get_db
 
-    with TestClient(app) as test_client:
-        yield test_client
+    # Cookies are the only client-side state a request can leave behind
+    gateway_client.cookies.clear()
+    yield gateway_client
 
     # Restore original state
     app.dependency_overrides.clear()
@@ -186,6 +329,19 @@ def client(test_db_engine, db_session: Session) -> Generator[TestClient, None, N
     db_module.get_sessionmaker = original_get_sessionmaker
 
 
+@pytest.fixture
+async def aclient(client, gateway_app) -> AsyncGenerator[httpx.AsyncClient, None]:
+    """
+    Async client that calls the app in-process over ASGI.
+
+    Shares the database wiring set up by ``client`` but skips TestClient's
+    per-request hop through a worker thread, which dominates for cheap endpoints.
+    """
+    transport = httpx.ASGITransport(app=gateway_app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as ac:
+        yield ac
+
+
 @pytest.fixture
 def sample_approval_data():
     """Sample data for approval tests."""
@@ -232,6 +388,19 @@ def reset_environment():
     get_settings.cache_clear()
 
 
+@pytest.fixture(autouse=True)
+def reset_temporal_gateway():
+    """Drop the cached Temporal gateway after each test.
+
+    App paths such as approval decisions populate ``temporal_client._gw`` via
+    ``get_temporal()``; resetting it keeps later tests order-independent.
+    """
+    yield
+    temporal_client = sys.modules.get("services.gateway.app.services.temporal_client")
+    if temporal_client is not None:
+        temporal_client._gw = None
+
+
 @pytest.fixture
 def mock_slack_client(mocker):
     """Mock SlackClient for tests that don't need real Slack integration."""
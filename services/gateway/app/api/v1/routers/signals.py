@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from collections.abc import Callable, Mapping
+from enum import StrEnum
 from typing import Any
 
 import yaml
@@ -12,69 +14,108 @@ from ...deps import get_db_session
 router = APIRouter(prefix="/v1/signals", tags=["signals"])
 
 
-def _evaluate_rule(session: Session, rule: dict[str, Any]) -> list[dict[str, Any]]:
+# Statements are built once at import; hour thresholds are bound per call so the
+# SQL text stays constant and SQLAlchemy's compiled cache can be reused.
+_STALE_PR_SQL = text(
+    "select delivery_id, min(received_at) as opened_at "
+    "from events_raw where source='github' and event_type='pull_request' "
+    "group by delivery_id having now() - min(received_at) > interval '1 hour' * :hours"
+)
+
+_WIP_SQL = text(
+    "select date_trunc('day', now()) as day, count(*) as wip "
+    "from (select delivery_id, min(received_at) as opened_at from events_raw "
+    "where source='github' and event_type='pull_request' group by delivery_id) o "
+    "left join (select delivery_id, min(received_at) as closed_at from events_raw "
+    "where source='github' and event_type='deployment_status' and payload like '%"
+    "state"
+    ": "
+    "success"
+    "%' group by delivery_id) c "
+    "using (delivery_id) where c.closed_at is null"
+)
+
+_DEFAULT_TICKET_PATTERN = "[A-Z]+-[0-9]+"
+
+_NO_TICKET_LINK_SQL = text(
+    "select delivery_id, min(received_at) as opened_at from events_raw "
+    "where source='github' and event_type='pull_request' and payload !~ :pattern "
+    "group by delivery_id order by opened_at desc limit 200"
+)
+
+_PR_WITHOUT_REVIEW_SQL = text(
+    "with prs as (select delivery_id, min(received_at) opened_at from events_raw "
+    "where source='github' and event_type='pull_request' group by delivery_id), "
+    "reviews as (select delivery_id, min(received_at) reviewed_at from events_raw "
+    "where source='github' and event_type in ('pull_request_review','pull_request_review_comment') group by delivery_id) "
+    "select prs.delivery_id, prs.opened_at from prs left join reviews using (delivery_id) "
+    "where reviews.reviewed_at is null and now() - prs.opened_at > interval '1 hour' * :hours"
+)
+
+
+def _stale_pr(session: Session, rule: Mapping[str, Any]) -> list[dict[str, Any]]:
+    hours = int(rule.get("older_than_hours", 48))
+    rows = session.execute(_STALE_PR_SQL, {"hours": hours}).mappings().all()
+    return [dict(r) for r in rows]
+
+
+def _wip_limit_exceeded(
+    session: Session, rule: Mapping[str, Any]
+) -> list[dict[str, Any]]:
+    limit = int(rule.get("limit", 5))
+    row = session.execute(_WIP_SQL).mappings().first()
+    wip = int(row["wip"]) if row else 0
+    return [
+        {
+            "day": str(row["day"]) if row else None,
+            "wip": wip,
+            "exceeded": wip > limit,
+        }
+    ]
+
+
+def _no_ticket_link(session: Session, rule: Mapping[str, Any]) -> list[dict[str, Any]]:
+    # Detect PRs whose payload does not match a ticket pattern (very rough placeholder).
+    # The regex is matched by Postgres, which caches compiled patterns per backend;
+    # binding it keeps the statement text identical for every pattern.
+    pattern = rule.get("ticket_pattern", _DEFAULT_TICKET_PATTERN)
+    rows = session.execute(_NO_TICKET_LINK_SQL, {"pattern": pattern}).mappings().all()
+    return [dict(r) for r in rows]
+
+
+def _pr_without_review(
+    session: Session, rule: Mapping[str, Any]
+) -> list[dict[str, Any]]:
+    hours = int(rule.get("older_than_hours", 12))
+    rows = session.execute(_PR_WITHOUT_REVIEW_SQL, {"hours": hours}).mappings().all()
+    return [dict(r) for r in rows]
+
+
+class RuleKind(StrEnum):
+    STALE_PR = "stale_pr"
+    WIP_LIMIT_EXCEEDED = "wip_limit_exceeded"
+    NO_TICKET_LINK = "no_ticket_link"
+    PR_WITHOUT_REVIEW = "pr_without_review"
+
+
+# StrEnum members hash and compare like their values, so rules loaded from
+# YAML/JSON dispatch with their plain ``kind`` strings, no translation step
+_RULE_HANDLERS: dict[
+    str, Callable[[Session, Mapping[str, Any]], list[dict[str, Any]]]
+] = {
+    RuleKind.STALE_PR: _stale_pr,
+    RuleKind.WIP_LIMIT_EXCEEDED: _wip_limit_exceeded,
+    RuleKind.NO_TICKET_LINK: _no_ticket_link,
+    RuleKind.PR_WITHOUT_REVIEW: _pr_without_review,
+}
+
+
+def _evaluate_rule(session: Session, rule: Mapping[str, Any]) -> list[dict[str, Any]]:
     kind = rule.get("kind")
-    if kind == "stale_pr":
-        hours = int(rule.get("older_than_hours", 48))
-        sql = (
-            "select delivery_id, min(received_at) as opened_at "
-            "from events_raw where source='github' and event_type='pull_request' "
-            "group by delivery_id having now() - min(received_at) > interval '%d hours'"
-            % hours
-        )
-        rows = session.execute(text(sql)).mappings().all()
-        return [dict(r) for r in rows]
-
-    if kind == "wip_limit_exceeded":
-        limit = int(rule.get("limit", 5))
-        sql = (
-            "select date_trunc('day', now()) as day, count(*) as wip "
-            "from (select delivery_id, min(received_at) as opened_at from events_raw "
-            "where source='github' and event_type='pull_request' group by delivery_id) o "
-            "left join (select delivery_id, min(received_at) as closed_at from events_raw "
-            "where source='github' and event_type='deployment_status' and payload like '%"
-            "state"
-            ": "
-            "success"
-            "%' group by delivery_id) c "
-            "using (delivery_id) where c.closed_at is null"
-        )
-        row = session.execute(text(sql)).mappings().first()
-        wip = int(row["wip"]) if row else 0
-        return [
-            {
-                "day": str(row["day"]) if row else None,
-                "wip": wip,
-                "exceeded": wip > limit,
-            }
-        ]
-
-    if kind == "no_ticket_link":
-        # Detect PRs whose payload does not match a ticket pattern (very rough placeholder)
-        pattern = rule.get("ticket_pattern", "[A-Z]+-[0-9]+")
-        sql = (
-            "select delivery_id, min(received_at) as opened_at from events_raw "
-            "where source='github' and event_type='pull_request' and payload !~ :pattern "
-            "group by delivery_id order by opened_at desc limit 200"
-        )
-        rows = session.execute(text(sql), {"pattern": pattern}).mappings().all()
-        return [dict(r) for r in rows]
-
-    if kind == "pr_without_review":
-        hours = int(rule.get("older_than_hours", 12))
-        sql = (
-            "with prs as (select delivery_id, min(received_at) opened_at from events_raw "
-            "where source='github' and event_type='pull_request' group by delivery_id), "
-            "reviews as (select delivery_id, min(received_at) reviewed_at from events_raw "
-            "where source='github' and event_type in ('pull_request_review','pull_request_review_comment') group by delivery_id) "
-            "select prs.delivery_id, prs.opened_at from prs left join reviews using (delivery_id) "
-            "where reviews.reviewed_at is null and now() - prs.opened_at > interval '%d hours'"
-            % hours
-        )
-        rows = session.execute(text(sql)).mappings().all()
-        return [dict(r) for r in rows]
-
-    raise HTTPException(status_code=400, detail=f"unsupported rule kind: {kind}")
+    handler = _RULE_HANDLERS.get(kind)
+    if handler is None:
+        raise HTTPException(status_code=400, detail=f"unsupported rule kind: {kind}")
+    return handler(session, rule)
 
 
 @router.post("/evaluate")
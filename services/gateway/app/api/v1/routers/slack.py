@@ -3,7 +3,10 @@ from __future__ import annotations
 import hashlib
 import hmac
 import json
+import re
+import threading
 import time
+from collections import OrderedDict
 from typing import Any
 from urllib.parse import parse_qs
 
@@ -21,6 +24,32 @@ from ....models.workflow_jobs import WorkflowJob
 
 router = APIRouter(prefix="/v1/slack", tags=["slack"])
 
+# Slack retries a delivery (same timestamp, signature and body) up to 3 times;
+# remember recent successful verifications so retries skip the HMAC. The
+# timestamp freshness check still runs before every lookup.
+_VERIFIED: OrderedDict[tuple[str, str, str, bytes], float] = OrderedDict()
+_VERIFIED_MAX = 1024
+_VERIFIED_TTL_SEC = 300
+_VERIFIED_LOCK = threading.Lock()
+
+# Slack's v0 signature is exactly 64 lowercase hex chars after the prefix
+_SIGNATURE_RE = re.compile(r"v0=[0-9a-f]{64}")
+
+# Keyed HMAC objects per signing secret; copying one skips re-deriving the
+# inner/outer key pads on every request
+_HMAC_TEMPLATES: dict[str, hmac.HMAC] = {}
+_HMAC_TEMPLATES_MAX = 4
+
+
+def _signing_mac(secret: str) -> hmac.HMAC:
+    template = _HMAC_TEMPLATES.get(secret)
+    if template is None:
+        if len(_HMAC_TEMPLATES) >= _HMAC_TEMPLATES_MAX:
+            _HMAC_TEMPLATES.clear()
+        template = hmac.new(secret.encode(), digestmod=hashlib.sha256)
+        _HMAC_TEMPLATES[secret] = template
+    return template.copy()
+
 
 def _verify_slack(
     request: Request, body: bytes, ts: str | None, sig: str | None
@@ -36,13 +65,36 @@ def _verify_slack(
         ts_int = int(ts)
     except Exception:
         raise HTTPException(status_code=401, detail="bad timestamp")
-    if abs(int(time.time()) - ts_int) > 60 * 5:
+    now = time.time()
+    if abs(int(now) - ts_int) > 60 * 5:
         raise HTTPException(status_code=401, detail="timestamp too old")
-    basestring = f"v0:{ts}:{body.decode()}".encode()
-    mac = hmac.new(settings.slack_signing_secret.encode(), basestring, hashlib.sha256)
-    expected = f"v0={mac.hexdigest()}"
-    if not hmac.compare_digest(expected, sig):
+    # Keyed on the secret too, so a rotated secret never reuses old results
+    key = (
+        settings.slack_signing_secret,
+        ts,
+        sig,
+        hashlib.blake2b(body, digest_size=16).digest(),
+    )
+    with _VERIFIED_LOCK:
+        verified_at = _VERIFIED.get(key)
+    if verified_at is not None and now - verified_at <= _VERIFIED_TTL_SEC:
+        return
+    # Sign the raw bytes; decoding and re-encoding the body would copy it twice
+    basestring = b"v0:%s:%s" % (ts.encode(), body)
+    mac = _signing_mac(settings.slack_signing_secret)
+    mac.update(basestring)
+    expected = mac.digest()
+    # Compare the 32 raw digest bytes rather than 64-char hex strings. Check the
+    # format first: bytes.fromhex also accepts uppercase and embedded whitespace
+    if _SIGNATURE_RE.fullmatch(sig) is None:
+        raise HTTPException(status_code=401, detail="invalid signature")
+    if not hmac.compare_digest(expected, bytes.fromhex(sig[3:])):
         raise HTTPException(status_code=401, detail="invalid signature")
+    with _VERIFIED_LOCK:
+        _VERIFIED[key] = now
+        _VERIFIED.move_to_end(key)
+        if len(_VERIFIED) > _VERIFIED_MAX:
+            _VERIFIED.popitem(last=False)
 
 
 # Helper functions to reduce code duplication
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import json
 import os
+from collections.abc import Iterable
 from typing import Any
 
 from ..core.logging import get_logger
@@ -36,6 +37,16 @@ class EventBus:
         data = json.dumps(payload).encode("utf-8")
         await self._nats.publish(subject, data)
 
+    async def publish_json_many(
+        self, subject: str, payloads: Iterable[dict[str, Any]]
+    ) -> None:
+        """Publish several payloads on the shared connection, flushing once."""
+        if not _HAS_NATS or self._nats is None:
+            return
+        for payload in payloads:
+            await self._nats.publish(subject, json.dumps(payload).encode("utf-8"))
+        await self._nats.flush()
+
 
 _event_bus: EventBus | None = None
 
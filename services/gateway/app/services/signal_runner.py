@@ -1,10 +1,15 @@
 from __future__ import annotations
 
+import asyncio
 import os
 import threading
+from collections.abc import Callable, Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
 from typing import Any
 
 import yaml
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
 from ..api.v1.routers.policy import _load_policy
@@ -14,63 +19,150 @@ from ..models.action_log import ActionLog
 from ..models.workflow_jobs import WorkflowJob
 from ..services.event_bus import get_event_bus
 
-DEFAULT_RULES: list[dict[str, Any]] = [
-    {"name": "stale48h", "kind": "stale_pr", "older_than_hours": 48},
-    {"name": "wip_limit", "kind": "wip_limit_exceeded", "limit": 5},
-    {"name": "pr_no_review", "kind": "pr_without_review", "older_than_hours": 12},
-]
+# Read-only so the same objects can be handed to every caller without copying
+DEFAULT_RULES: tuple[Mapping[str, Any], ...] = tuple(
+    MappingProxyType(rule)
+    for rule in (
+        {"name": "stale48h", "kind": "stale_pr", "older_than_hours": 48},
+        {"name": "wip_limit", "kind": "wip_limit_exceeded", "limit": 5},
+        {"name": "pr_no_review", "kind": "pr_without_review", "older_than_hours": 12},
+    )
+)
 
 
-def _load_rules() -> list[dict[str, Any]]:
+# Kept below the engine's pool_size so parallel rule queries don't queue on it
+_MAX_RULE_WORKERS = 4
+
+_ENABLE_TRUTHY = frozenset({"1", "true", "yes", "on"})
+
+# Parsed rules keyed by path -> ((mtime_ns, size), rules); the evaluator reloads
+# every tick, so only re-parse the YAML when the file actually changes.
+_RULES_CACHE: dict[str, tuple[tuple[int, int], list[dict[str, Any]]]] = {}
+
+
+def _file_stamp(path: str) -> tuple[int, int] | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _load_rules() -> Sequence[Mapping[str, Any]]:
     path = os.getenv("RULES_PATH", "/app/app/config/rules.yml")
     if not os.path.exists(path):
         return DEFAULT_RULES
+    stamp = _file_stamp(path)
+    cached = _RULES_CACHE.get(path)
+    if stamp is not None and cached is not None and cached[0] == stamp:
+        return cached[1]
     try:
         with open(path, encoding="utf-8") as f:
             data = yaml.safe_load(f) or []
             if isinstance(data, list):
+                if stamp is not None:
+                    _RULES_CACHE[path] = (stamp, data)
                 return data
     except Exception:
         pass
     return DEFAULT_RULES
 
 
+_POLICY_CACHE: dict[str, tuple[tuple[int, int], dict[str, Any]]] = {}
+
+
+def _load_policy_cached() -> dict[str, Any]:
+    path = os.getenv("POLICY_PATH", "/app/app/config/policy.yml")
+    stamp = _file_stamp(path)
+    cached = _POLICY_CACHE.get(path)
+    if stamp is not None and cached is not None and cached[0] == stamp:
+        return cached[1]
+    policy = _load_policy()
+    if stamp is not None:
+        _POLICY_CACHE[path] = (stamp, policy)
+    return policy
+
+
+def _evaluate_rules(
+    session: Session,
+    rules: Sequence[Mapping[str, Any]],
+    session_factory: Callable[[], Any] | None = None,
+) -> list[list[dict[str, Any]]]:
+    """Run each rule's query, in parallel when a session factory is available.
+
+    Rule queries are independent reads, so with a factory each worker opens its
+    own session (Sessions aren't thread-safe) and the DB latency overlaps.
+    Without one, rules run sequentially on the caller's session.
+    """
+    if session_factory is None or len(rules) < 2:
+        return [_evaluate_rule(session, rule) for rule in rules]
+
+    def _run(rule: Mapping[str, Any]) -> list[dict[str, Any]]:
+        with session_factory() as worker_session:
+            return _evaluate_rule(worker_session, rule)
+
+    workers = min(_MAX_RULE_WORKERS, len(rules))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_run, rules))
+
+
 def evaluate_and_log(
-    session: Session, rules: list[dict[str, Any]] | None = None
+    session: Session,
+    rules: Sequence[Mapping[str, Any]] | None = None,
+    *,
+    policy: dict[str, Any] | None = None,
+    session_factory: Callable[[], Any] | None = None,
 ) -> int:
     rules = rules or _load_rules()
     inserted = 0
-    policy_map = _load_policy()
-    for rule in rules:
+    policy_map = policy if policy is not None else _load_policy_cached()
+    log_rows: list[dict[str, Any]] = []
+    job_rows: list[dict[str, Any]] = []
+    # A disabled rule can never produce results; skip its query entirely
+    active = [rule for rule in rules if rule.get("enabled", True) is not False]
+    for rule, results in zip(
+        active, _evaluate_rules(session, active, session_factory), strict=True
+    ):
         name = rule.get("name", rule.get("kind", "rule"))
-        results = _evaluate_rule(session, rule)
         action = policy_map.get(rule.get("kind"), {}).get("action", "nudge")
         for row in results:
             subject = str(row.get("delivery_id") or row)
-            log = ActionLog(
-                rule_name=name, subject=subject, action=action, payload=str(row)
+            log_rows.append(
+                {
+                    "rule_name": name,
+                    "subject": subject,
+                    "action": action,
+                    "payload": str(row),
+                }
             )
-            session.add(log)
-            job = WorkflowJob(
-                status="queued",
-                rule_kind=rule.get("kind", name),
-                subject=subject,
-                payload=str(row),
+            job_rows.append(
+                {
+                    "status": "queued",
+                    "rule_kind": rule.get("kind", name),
+                    "subject": subject,
+                    "payload": str(row),
+                }
             )
-            session.add(job)
             inserted += 1
+    if inserted:
+        # One multi-row INSERT per table instead of a flush per ORM object
+        session.execute(insert(ActionLog), log_rows)
+        session.execute(insert(WorkflowJob), job_rows)
     session.commit()
-    # publish summary
+    # Publish everything for this tick as one batch on the shared bus connection.
+    # The evaluator thread has no event loop; skip rather than build a coroutine
+    # that can never be scheduled.
+    events = [
+        {"rules": [r.get("kind") for r in rules], "inserted": inserted},
+    ]
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return inserted
     try:
-        import asyncio
-
-        asyncio.create_task(
-            get_event_bus().publish_json(
-                subject="signals.evaluated",
-                payload={
-                    "rules": [r.get("kind") for r in (rules or [])],
-                    "inserted": inserted,
-                },
+        loop.create_task(
+            get_event_bus().publish_json_many(
+                subject="signals.evaluated", payloads=events
             )
         )
     except Exception:
@@ -83,28 +175,43 @@ class EvaluatorThread(threading.Thread):
         super().__init__(daemon=True)
         self._session_factory = session_factory
         self._interval = interval_sec
-        self._stop = threading.Event()
+        # Not ``_stop``: that name shadows Thread._stop(), which join() calls
+        self._stop_event = threading.Event()
         self._logger = get_logger(__name__)
 
-    def run(self) -> None:  # pragma: no cover - background loop
-        while not self._stop.is_set():
-            try:
-                with self._session_factory() as session:
-                    inserted = evaluate_and_log(session)
-                    self._logger.info("evaluator.cycle_complete", inserted=inserted)
-            except Exception as exc:
-                # Keep loop alive; surface for observability
-                self._logger.warning("evaluator.cycle_error", error=str(exc))
-            self._stop.wait(self._interval)
+    def run(self) -> None:
+        if self._stop_event.is_set():
+            return
+        # Event.wait returns True as soon as stop() is called, so shutdown
+        # doesn't have to sit out the rest of the interval
+        while True:
+            self._run_cycle()
+            if self._stop_event.wait(self._interval):
+                break
+
+    def _run_cycle(self) -> None:
+        try:
+            with self._session_factory() as session:
+                inserted = evaluate_and_log(
+                    session, session_factory=self._session_factory
+                )
+                self._logger.info("evaluator.cycle_complete", inserted=inserted)
+        except Exception as exc:
+            # Keep loop alive; surface for observability
+            self._logger.warning("evaluator.cycle_error", error=str(exc))
 
     def stop(self) -> None:
-        self._stop.set()
+        self._stop_event.set()
 
 
 def maybe_start_evaluator(app, session_factory) -> EvaluatorThread | None:
-    enabled = os.getenv("EVALUATOR_ENABLED", "false").lower() in {"1", "true", "yes"}
+    enabled = os.getenv("EVALUATOR_ENABLED", "false").lower() in _ENABLE_TRUTHY
     if not enabled:
         return None
+    if not _load_rules():
+        # An empty rules file means every tick would be a no-op
+        get_logger(__name__).info("evaluator.not_started", reason="no rules")
+        return None
     interval = int(os.getenv("EVALUATOR_INTERVAL_SEC", "600"))
     t = EvaluatorThread(session_factory, interval)
     t.start()
@@ -190,6 +190,37 @@ class TestEventBusPublishJson:
             mock_nats_client.publish.assert_awaited_once_with("complex.event", expected_data)
 
 
+class TestEventBusPublishJsonMany:
+    """Test EventBus.publish_json_many method."""
+
+    @pytest.mark.asyncio
+    async def test_publish_json_many_when_not_connected(self):
+        """Test publish_json_many() is a no-op when not connected."""
+        with patch("services.gateway.app.services.event_bus._HAS_NATS", True):
+            bus = EventBus()
+
+            # Should not raise
+            await bus.publish_json_many("test.subject", [{"key": "value"}])
+
+    @pytest.mark.asyncio
+    async def test_publish_json_many_flushes_once(self):
+        """Test publish_json_many() publishes each payload then flushes once."""
+        bus = EventBus()
+
+        mock_nats_client = AsyncMock()
+        bus._nats = mock_nats_client
+
+        with patch("services.gateway.app.services.event_bus._HAS_NATS", True):
+            payloads = [{"n": 1}, {"n": 2}, {"n": 3}]
+            await bus.publish_json_many("events.batch", payloads)
+
+            assert mock_nats_client.publish.await_count == 3
+            mock_nats_client.publish.assert_awaited_with(
+                "events.batch", json.dumps({"n": 3}).encode("utf-8")
+            )
+            mock_nats_client.flush.assert_awaited_once()
+
+
 class TestGetEventBus:
     """Test get_event_bus singleton function."""
 
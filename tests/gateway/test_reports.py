@@ -11,33 +11,54 @@ import pytest
 from unittest.mock import Mock, patch
 from fastapi.testclient import TestClient
 
+# Keep this module on a single xdist worker under ``--dist loadgroup`` so the
+# app/client fixtures stay warm across the whole file.
+pytestmark = pytest.mark.xdist_group(name="gateway_reports")
+
+STANDUP_URL = "/v1/reports/standup"
+STANDUP_POST_URL = "/v1/reports/standup/post"
+SPRINT_HEALTH_URL = "/v1/reports/sprint-health"
+SPRINT_HEALTH_POST_URL = "/v1/reports/sprint-health/post"
+
+# Most report SQL is PostgreSQL-specific, so SQLite runs may surface 500/503
+_OK_OR_INFRA = (200, 500, 503)
+
+
+@pytest.mark.parametrize(
+    "endpoint,payload",
+    [
+        pytest.param(STANDUP_URL, {}, id="standup-empty-body"),
+        pytest.param(STANDUP_URL, None, id="standup-null-body"),
+        pytest.param(STANDUP_URL, {"older_than_hours": 72}, id="standup-older-than-hours"),
+        pytest.param(
+            STANDUP_POST_URL,
+            {"older_than_hours": 72, "channel": "#test"},
+            id="standup-post-parameters",
+        ),
+        pytest.param(STANDUP_POST_URL, {"older_than_hours": 48}, id="standup-post-no-channel"),
+        pytest.param(SPRINT_HEALTH_URL, {}, id="sprint-health-empty-body"),
+        pytest.param(SPRINT_HEALTH_URL, None, id="sprint-health-null-body"),
+        pytest.param(SPRINT_HEALTH_URL, {"days": 7}, id="sprint-health-days"),
+        pytest.param(
+            SPRINT_HEALTH_POST_URL,
+            {"days": 7, "channel": "#test"},
+            id="sprint-health-post-parameters",
+        ),
+        pytest.param(SPRINT_HEALTH_POST_URL, {"days": 14}, id="sprint-health-post-no-channel"),
+    ],
+)
+def test_endpoint_accepts(client: TestClient, endpoint: str, payload):
+    """Test that report endpoints accept the given body (defaults when omitted)."""
+    response = client.post(endpoint, json=payload)
+    assert response.status_code in _OK_OR_INFRA
+
 
 class TestStandup:
     """Tests for POST /v1/reports/standup endpoint."""
 
-    def test_standup_accepts_empty_body(self, client: TestClient):
-        """Test that standup accepts empty request body."""
-        response = client.post("/v1/reports/standup", json={})
-        # May fail with PostgreSQL-specific SQL, but validates structure
-        assert response.status_code in [200, 500, 503]
-
-    def test_standup_accepts_null_body(self, client: TestClient):
-        """Test that standup accepts null body."""
-        response = client.post("/v1/reports/standup", json=None)
-        # May fail with PostgreSQL-specific SQL
-        assert response.status_code in [200, 500, 503]
-
-    def test_standup_with_older_than_hours(self, client: TestClient):
-        """Test standup with custom older_than_hours parameter."""
-        payload = {"older_than_hours": 72}
-
-        response = client.post("/v1/reports/standup", json=payload)
-        # May fail due to PostgreSQL, but validates parameter accepted
-        assert response.status_code in [200, 500, 503]
-
     def test_standup_response_structure(self, client: TestClient):
         """Test standup response has expected structure."""
-        response = client.post("/v1/reports/standup", json={})
+        response = client.post(STANDUP_URL, json={})
 
         if response.status_code == 200:
             data = response.json()
@@ -66,7 +87,7 @@ class TestStandup:
         """
         payload = {"older_than_hours": 48}
 
-        response = client.post("/v1/reports/standup", json=payload)
+        response = client.post(STANDUP_URL, json=payload)
         assert response.status_code == 200
         data = response.json()
         report = data["report"]
@@ -96,56 +117,18 @@ class TestStandupPost:
             "channel": "#engineering"
         }
 
-        response = client.post("/v1/reports/standup/post", json=payload)
+        response = client.post(STANDUP_POST_URL, json=payload)
         assert response.status_code == 200
         data = response.json()
         assert "posted" in data
 
-    def test_standup_post_accepts_parameters(self, client: TestClient):
-        """Test that standup/post accepts parameters."""
-        payload = {
-            "older_than_hours": 72,
-            "channel": "#test"
-        }
-
-        response = client.post("/v1/reports/standup/post", json=payload)
-        # Will fail without Slack/PostgreSQL, but validates structure
-        assert response.status_code in [200, 500, 503]
-
-    def test_standup_post_without_channel(self, client: TestClient):
-        """Test standup/post without specifying channel."""
-        payload = {"older_than_hours": 48}
-
-        response = client.post("/v1/reports/standup/post", json=payload)
-        # Should accept missing channel (may use default or fail gracefully)
-        assert response.status_code in [200, 500, 503]
-
 
 class TestSprintHealth:
     """Tests for POST /v1/reports/sprint-health endpoint."""
 
-    def test_sprint_health_accepts_empty_body(self, client: TestClient):
-        """Test that sprint-health accepts empty request body."""
-        response = client.post("/v1/reports/sprint-health", json={})
-        # May fail with PostgreSQL-specific SQL
-        assert response.status_code in [200, 500, 503]
-
-    def test_sprint_health_accepts_null_body(self, client: TestClient):
-        """Test that sprint-health accepts null body."""
-        response = client.post("/v1/reports/sprint-health", json=None)
-        assert response.status_code in [200, 500, 503]
-
-    def test_sprint_health_with_days_parameter(self, client: TestClient):
-        """Test sprint-health with custom days parameter."""
-        payload = {"days": 7}
-
-        response = client.post("/v1/reports/sprint-health", json=payload)
-        # May fail due to PostgreSQL
-        assert response.status_code in [200, 500, 503]
-
     def test_sprint_health_response_structure(self, client: TestClient):
         """Test sprint-health response has expected structure."""
-        response = client.post("/v1/reports/sprint-health", json={})
+        response = client.post(SPRINT_HEALTH_URL, json={})
 
         if response.status_code == 200:
             data = response.json()
@@ -178,7 +161,7 @@ class TestSprintHealth:
         """
         payload = {"days": 14}
 
-        response = client.post("/v1/reports/sprint-health", json=payload)
+        response = client.post(SPRINT_HEALTH_URL, json=payload)
         assert response.status_code == 200
         data = response.json()
         report = data["report"]
@@ -211,52 +194,20 @@ class TestSprintHealthPost:
             "channel": "#engineering"
         }
 
-        response = client.post("/v1/reports/sprint-health/post", json=payload)
+        response = client.post(SPRINT_HEALTH_POST_URL, json=payload)
         assert response.status_code == 200
         data = response.json()
         assert "posted" in data
 
-    def test_sprint_health_post_accepts_parameters(self, client: TestClient):
-        """Test that sprint-health/post accepts parameters."""
-        payload = {
-            "days": 7,
-            "channel": "#test"
-        }
-
-        response = client.post("/v1/reports/sprint-health/post", json=payload)
-        # Will fail without Slack/PostgreSQL, but validates structure
-        assert response.status_code in [200, 500, 503]
-
-    def test_sprint_health_post_without_channel(self, client: TestClient):
-        """Test sprint-health/post without specifying channel."""
-        payload = {"days": 14}
-
-        response = client.post("/v1/reports/sprint-health/post", json=payload)
-        # Should accept missing channel
-        assert response.status_code in [200, 500, 503]
-
 
 class TestReportsParameterHandling:
     """Tests for parameter handling across all report endpoints."""
 
-    def test_standup_default_older_than_hours(self, client: TestClient):
-        """Test that standup uses default 48 hours when not specified."""
-        # Empty body should use default
-        response = client.post("/v1/reports/standup", json={})
-        # Can't verify default value without PostgreSQL, but validates acceptance
-        assert response.status_code in [200, 500, 503]
-
-    def test_sprint_health_default_days(self, client: TestClient):
-        """Test that sprint-health uses default 14 days when not specified."""
-        # Empty body should use default
-        response = client.post("/v1/reports/sprint-health", json={})
-        assert response.status_code in [200, 500, 503]
-
     def test_standup_string_parameter_converted(self, client: TestClient):
         """Test that string parameters are converted to int."""
         payload = {"older_than_hours": "72"}  # String instead of int
 
-        response = client.post("/v1/reports/standup", json=payload)
+        response = client.post(STANDUP_URL, json=payload)
         # Should convert to int (or fail gracefully)
         assert response.status_code in [200, 400, 422, 500, 503]
 
@@ -264,7 +215,7 @@ class TestReportsParameterHandling:
         """Test that string days parameter is converted to int."""
         payload = {"days": "7"}  # String instead of int
 
-        response = client.post("/v1/reports/sprint-health", json=payload)
+        response = client.post(SPRINT_HEALTH_URL, json=payload)
         # Should convert to int (or fail gracefully)
         assert response.status_code in [200, 400, 422, 500, 503]
 
@@ -291,7 +242,7 @@ class TestSlackPostingIntegration:
 
                 payload = {"older_than_hours": 48, "channel": "#test"}
 
-                response = client.post("/v1/reports/standup/post", json=payload)
+                response = client.post(STANDUP_POST_URL, json=payload)
 
                 # Should succeed with mocked dependencies
                 assert response.status_code == 200
@@ -323,7 +274,7 @@ class TestSlackPostingIntegration:
 
                 payload = {"older_than_hours": 48}
 
-                response = client.post("/v1/reports/standup/post", json=payload)
+                response = client.post(STANDUP_POST_URL, json=payload)
 
                 assert response.status_code == 200
                 call_args = mock_instance.post_blocks.call_args
@@ -348,7 +299,7 @@ class TestSlackPostingIntegration:
 
                 payload = {"channel": "#eng"}
 
-                response = client.post("/v1/reports/standup/post", json=payload)
+                response = client.post(STANDUP_POST_URL, json=payload)
 
                 assert response.status_code == 200
                 call_args = mock_instance.post_blocks.call_args
@@ -385,7 +336,7 @@ class TestSlackPostingIntegration:
 
                 payload = {"days": 14, "channel": "#metrics"}
 
-                response = client.post("/v1/reports/sprint-health/post", json=payload)
+                response = client.post(SPRINT_HEALTH_POST_URL, json=payload)
 
                 assert response.status_code == 200
                 data = response.json()
@@ -417,7 +368,7 @@ class TestSlackPostingIntegration:
 
                 payload = {"days": 7, "channel": "#health"}
 
-                response = client.post("/v1/reports/sprint-health/post", json=payload)
+                response = client.post(SPRINT_HEALTH_POST_URL, json=payload)
 
                 assert response.status_code == 200
                 call_args = mock_instance.post_blocks.call_args
@@ -451,7 +402,7 @@ class TestSlackPostingIntegration:
 
                 payload = {"days": 14}
 
-                response = client.post("/v1/reports/sprint-health/post", json=payload)
+                response = client.post(SPRINT_HEALTH_POST_URL, json=payload)
 
                 assert response.status_code == 200
                 call_args = mock_instance.post_blocks.call_args
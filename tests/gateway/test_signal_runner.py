@@ -4,12 +4,20 @@ Tests for signal_runner service.
 Tests the signal evaluation and background evaluation service.
 Current coverage: 31% → Target: 70%+
 """
+import asyncio
+import io
 import os
 import pytest
-from unittest.mock import Mock, patch, mock_open, MagicMock
+from unittest.mock import DEFAULT, AsyncMock, Mock, patch, MagicMock
 import threading
 
+import yaml
+
+from services.gateway.app.services import signal_runner as _sr
 from services.gateway.app.services.signal_runner import (
+    _POLICY_CACHE,
+    _RULES_CACHE,
+    _load_policy_cached,
     _load_rules,
     evaluate_and_log,
     EvaluatorThread,
@@ -17,6 +25,36 @@ from services.gateway.app.services.signal_runner import (
     DEFAULT_RULES,
 )
 
+_RULES_YAML = """
+- name: custom_rule
+  kind: stale_pr
+  older_than_hours: 72
+- name: another_rule
+  kind: wip_limit_exceeded
+  limit: 10
+"""
+
+# Pre-parsed form of _RULES_YAML for tests that don't exercise YAML itself
+_PARSED_RULES = [
+    {"name": "custom_rule", "kind": "stale_pr", "older_than_hours": 72},
+    {"name": "another_rule", "kind": "wip_limit_exceeded", "limit": 10},
+]
+
+
+def _open_returning(text: str = ""):
+    """Patch builtins.open to hand back a real in-memory file instead of mock_open."""
+    return patch("builtins.open", side_effect=lambda *args, **kwargs: io.StringIO(text))
+
+
+@pytest.fixture(autouse=True)
+def clear_rules_cache():
+    """Drop parsed rules and policy cached by previous tests."""
+    _RULES_CACHE.clear()
+    _POLICY_CACHE.clear()
+    yield
+    _RULES_CACHE.clear()
+    _POLICY_CACHE.clear()
+
 
 class TestLoadRules:
     """Test _load_rules function."""
@@ -26,35 +64,42 @@ class TestLoadRules:
         with patch("os.path.exists", return_value=False):
             rules = _load_rules()
 
-            assert rules == DEFAULT_RULES
+            assert list(rules) == list(DEFAULT_RULES)
             assert len(rules) == 3
             assert rules[0]["kind"] == "stale_pr"
             assert rules[1]["kind"] == "wip_limit_exceeded"
             assert rules[2]["kind"] == "pr_without_review"
 
     def test_load_rules_from_file(self):
-        """Test loading rules from YAML file."""
-        yaml_content = """
-- name: custom_rule
-  kind: stale_pr
-  older_than_hours: 72
-- name: another_rule
-  kind: wip_limit_exceeded
-  limit: 10
-"""
+        """Test loading rules from a rules file."""
         with patch("os.path.exists", return_value=True):
-            with patch("builtins.open", mock_open(read_data=yaml_content)):
-                rules = _load_rules()
+            with _open_returning():
+                with patch.object(
+                    _sr.yaml,
+                    "safe_load",
+                    return_value=_PARSED_RULES,
+                ):
+                    rules = _load_rules()
 
-                assert len(rules) == 2
-                assert rules[0]["name"] == "custom_rule"
-                assert rules[0]["older_than_hours"] == 72
-                assert rules[1]["limit"] == 10
+                    assert len(rules) == 2
+                    assert rules[0]["name"] == "custom_rule"
+                    assert rules[0]["older_than_hours"] == 72
+                    assert rules[1]["limit"] == 10
+
+    def test_load_rules_yaml_parsing_integration(self, tmp_path):
+        """Test that a real YAML rules file is parsed into rule dicts."""
+        rules_file = tmp_path / "rules.yml"
+        rules_file.write_text(_RULES_YAML, encoding="utf-8")
+
+        with patch.dict(os.environ, {"RULES_PATH": str(rules_file)}):
+            rules = _load_rules()
+
+            assert rules == _PARSED_RULES
 
     def test_load_rules_empty_file_returns_empty_list(self):
         """Test that empty YAML file returns empty list."""
         with patch("os.path.exists", return_value=True):
-            with patch("builtins.open", mock_open(read_data="")):
+            with _open_returning(""):
                 rules = _load_rules()
 
                 # Empty YAML returns empty list, not defaults
@@ -64,36 +109,42 @@ class TestLoadRules:
         """Test that invalid YAML returns default rules."""
         invalid_yaml = "{ this is not: valid yaml ]["
         with patch("os.path.exists", return_value=True):
-            with patch("builtins.open", mock_open(read_data=invalid_yaml)):
+            with _open_returning(invalid_yaml):
                 rules = _load_rules()
 
                 assert rules == DEFAULT_RULES
 
     def test_load_rules_non_list_yaml_returns_defaults(self):
         """Test that non-list YAML structure returns defaults."""
-        yaml_content = """
-not_a_list: true
-some_key: some_value
-"""
         with patch("os.path.exists", return_value=True):
-            with patch("builtins.open", mock_open(read_data=yaml_content)):
-                rules = _load_rules()
+            with _open_returning():
+                with patch.object(
+                    _sr.yaml,
+                    "safe_load",
+                    return_value={"not_a_list": True, "some_key": "some_value"},
+                ):
+                    rules = _load_rules()
 
-                assert rules == DEFAULT_RULES
+                    assert rules == DEFAULT_RULES
 
     def test_load_rules_respects_environment_variable(self):
         """Test that RULES_PATH environment variable is respected."""
         custom_path = "/custom/path/rules.yml"
-        yaml_content = "- name: test\n  kind: stale_pr"
 
         with patch.dict(os.environ, {"RULES_PATH": custom_path}):
             with patch("os.path.exists", return_value=True):
-                with patch("builtins.open", mock_open(read_data=yaml_content)) as mock_file:
-                    rules = _load_rules()
-
-                    # Verify it tried to open the custom path
-                    mock_file.assert_called_once()
-                    assert len(rules) == 1
+                with _open_returning() as mock_file:
+                    with patch.object(
+                        _sr.yaml,
+                        "safe_load",
+                        return_value=[{"name": "test", "kind": "stale_pr"}],
+                    ):
+                        rules = _load_rules()
+
+                        # Verify it tried to open the custom path
+                        mock_file.assert_called_once()
+                        assert mock_file.call_args[0][0] == custom_path
+                        assert len(rules) == 1
 
     def test_load_rules_exception_during_read_returns_defaults(self):
         """Test that exceptions during file read return defaults."""
@@ -103,128 +154,307 @@ some_key: some_value
 
                 assert rules == DEFAULT_RULES
 
+    def test_load_rules_caches_unchanged_file(self, tmp_path):
+        """Test that an unchanged rules file is only parsed once."""
+        rules_file = tmp_path / "rules.yml"
+        rules_file.write_text("- name: test\n  kind: stale_pr\n", encoding="utf-8")
+
+        with patch.dict(os.environ, {"RULES_PATH": str(rules_file)}):
+            with patch.object(
+                _sr.yaml,
+                "safe_load",
+                wraps=yaml.safe_load,
+            ) as mock_load:
+                first = _load_rules()
+                second = _load_rules()
+
+                assert mock_load.call_count == 1
+                assert first == second == [{"name": "test", "kind": "stale_pr"}]
+
+    def test_load_rules_reparses_modified_file(self, tmp_path):
+        """Test that editing the rules file invalidates the cache."""
+        rules_file = tmp_path / "rules.yml"
+        rules_file.write_text("- name: test\n  kind: stale_pr\n", encoding="utf-8")
+
+        with patch.dict(os.environ, {"RULES_PATH": str(rules_file)}):
+            assert len(_load_rules()) == 1
+
+            rules_file.write_text(
+                "- name: a\n  kind: stale_pr\n- name: b\n  kind: wip_limit_exceeded\n",
+                encoding="utf-8",
+            )
+            rules = _load_rules()
+
+            assert [r["name"] for r in rules] == ["a", "b"]
+
 
 class TestEvaluateAndLog:
     """Test evaluate_and_log function."""
 
-    def test_evaluate_and_log_with_no_results(self):
+    @patch.multiple(_sr, _evaluate_rule=DEFAULT, _load_policy=DEFAULT)
+    def test_evaluate_and_log_with_no_results(self, **mocks):
         """Test evaluate_and_log when rules return no results."""
         mock_session = Mock()
+        mocks["_evaluate_rule"].return_value = []  # No results
+        mocks["_load_policy"].return_value = {}
 
-        with patch("services.gateway.app.services.signal_runner._evaluate_rule") as mock_eval:
-            with patch("services.gateway.app.services.signal_runner._load_policy") as mock_policy:
-                mock_eval.return_value = []  # No results
-                mock_policy.return_value = {}
-
-                rules = [{"name": "test_rule", "kind": "stale_pr"}]
-                count = evaluate_and_log(mock_session, rules)
+        rules = [{"name": "test_rule", "kind": "stale_pr"}]
+        count = evaluate_and_log(mock_session, rules)
 
-                assert count == 0
-                mock_session.add.assert_not_called()
-                mock_session.commit.assert_called_once()
+        assert count == 0
+        mock_session.execute.assert_not_called()
+        mock_session.commit.assert_called_once()
 
-    def test_evaluate_and_log_with_results(self):
+    @patch.multiple(_sr, _evaluate_rule=DEFAULT, _load_policy=DEFAULT)
+    def test_evaluate_and_log_with_results(self, **mocks):
         """Test evaluate_and_log creates ActionLog and WorkflowJob entries."""
         mock_session = Mock()
-
-        with patch("services.gateway.app.services.signal_runner._evaluate_rule") as mock_eval:
-            with patch("services.gateway.app.services.signal_runner._load_policy") as mock_policy:
-                # Mock rule results
-                mock_eval.return_value = [
-                    {"delivery_id": "org/repo#123", "title": "Test PR"},
-                    {"delivery_id": "org/repo#124", "title": "Another PR"},
-                ]
-                mock_policy.return_value = {"stale_pr": {"action": "nudge"}}
-
-                rules = [{"name": "stale48h", "kind": "stale_pr", "older_than_hours": 48}]
-                count = evaluate_and_log(mock_session, rules)
-
-                assert count == 2
-                # Should add 2 ActionLog + 2 WorkflowJob = 4 entries
-                assert mock_session.add.call_count == 4
-                mock_session.commit.assert_called_once()
-
-    def test_evaluate_and_log_uses_default_rules_when_none_provided(self):
+        # Mock rule results
+        mocks["_evaluate_rule"].return_value = [
+            {"delivery_id": "org/repo#123", "title": "Test PR"},
+            {"delivery_id": "org/repo#124", "title": "Another PR"},
+        ]
+        mocks["_load_policy"].return_value = {"stale_pr": {"action": "nudge"}}
+
+        rules = [{"name": "stale48h", "kind": "stale_pr", "older_than_hours": 48}]
+        count = evaluate_and_log(mock_session, rules)
+
+        assert count == 2
+        # One bulk INSERT for the 2 ActionLogs, one for the 2 WorkflowJobs
+        assert mock_session.execute.call_count == 2
+        (log_stmt, logs), (job_stmt, jobs) = (
+            c.args for c in mock_session.execute.call_args_list
+        )
+        assert log_stmt.table.name == "action_log"
+        assert job_stmt.table.name == "workflow_jobs"
+        assert [log["subject"] for log in logs] == ["org/repo#123", "org/repo#124"]
+        assert len(jobs) == 2
+        mock_session.commit.assert_called_once()
+
+    @patch.multiple(_sr, _evaluate_rule=DEFAULT, _load_policy=DEFAULT)
+    def test_evaluate_and_log_bulk_inserts_rows(self, db_session, **mocks):
+        """Test that the bulk INSERT writes ActionLog and WorkflowJob rows."""
+        from services.gateway.app.models.action_log import ActionLog
+        from services.gateway.app.models.workflow_jobs import WorkflowJob
+
+        mocks["_evaluate_rule"].return_value = [
+            {"delivery_id": "org/repo#1"},
+            {"delivery_id": "org/repo#2"},
+        ]
+        mocks["_load_policy"].return_value = {"stale_pr": {"action": "escalate"}}
+
+        count = evaluate_and_log(db_session, [{"name": "stale", "kind": "stale_pr"}])
+
+        assert count == 2
+        logs = db_session.query(ActionLog).order_by(ActionLog.id).all()
+        assert [(log.subject, log.action) for log in logs] == [
+            ("org/repo#1", "escalate"),
+            ("org/repo#2", "escalate"),
+        ]
+        assert all(log.created_at is not None for log in logs)
+        jobs = db_session.query(WorkflowJob).all()
+        assert {job.status for job in jobs} == {"queued"}
+        assert len(jobs) == 2
+
+    @patch.multiple(_sr, _evaluate_rule=DEFAULT, _load_policy=DEFAULT, _load_rules=DEFAULT)
+    def test_evaluate_and_log_uses_default_rules_when_none_provided(self, **mocks):
         """Test that evaluate_and_log uses default rules when none provided."""
         mock_session = Mock()
+        mocks["_evaluate_rule"].return_value = []
+        mocks["_load_policy"].return_value = {}
+        mocks["_load_rules"].return_value = DEFAULT_RULES
 
-        with patch("services.gateway.app.services.signal_runner._evaluate_rule") as mock_eval:
-            with patch("services.gateway.app.services.signal_runner._load_policy") as mock_policy:
-                with patch("services.gateway.app.services.signal_runner._load_rules") as mock_load:
-                    mock_eval.return_value = []
-                    mock_policy.return_value = {}
-                    mock_load.return_value = DEFAULT_RULES
-
-                    evaluate_and_log(mock_session, rules=None)
+        evaluate_and_log(mock_session, rules=None)
 
-                    mock_load.assert_called_once()
+        mocks["_load_rules"].assert_called_once()
 
-    def test_evaluate_and_log_handles_missing_delivery_id(self):
+    @patch.multiple(_sr, _evaluate_rule=DEFAULT, _load_policy=DEFAULT)
+    def test_evaluate_and_log_handles_missing_delivery_id(self, **mocks):
         """Test that evaluate_and_log handles results without delivery_id."""
         mock_session = Mock()
+        # Result without delivery_id
+        mocks["_evaluate_rule"].return_value = [{"pr_id": "12345", "no_delivery_id": True}]
+        mocks["_load_policy"].return_value = {"test": {"action": "block"}}
 
-        with patch("services.gateway.app.services.signal_runner._evaluate_rule") as mock_eval:
-            with patch("services.gateway.app.services.signal_runner._load_policy") as mock_policy:
-                # Result without delivery_id
-                mock_eval.return_value = [{"pr_id": "12345", "no_delivery_id": True}]
-                mock_policy.return_value = {"test": {"action": "block"}}
-
-                rules = [{"name": "test", "kind": "test"}]
-                count = evaluate_and_log(mock_session, rules)
+        rules = [{"name": "test", "kind": "test"}]
+        count = evaluate_and_log(mock_session, rules)
 
-                assert count == 1
-                # Should still create entries with stringified result as subject
-                assert mock_session.add.call_count == 2
+        assert count == 1
+        # Should still create entries with stringified result as subject
+        assert mock_session.execute.call_count == 2
 
-    def test_evaluate_and_log_uses_rule_kind_as_default_name(self):
+    @patch.multiple(_sr, _evaluate_rule=DEFAULT, _load_policy=DEFAULT)
+    def test_evaluate_and_log_uses_rule_kind_as_default_name(self, **mocks):
         """Test that rule kind is used as name when name is missing."""
         mock_session = Mock()
+        mocks["_evaluate_rule"].return_value = [{"delivery_id": "test#1"}]
+        mocks["_load_policy"].return_value = {"stale_pr": {"action": "nudge"}}
 
-        with patch("services.gateway.app.services.signal_runner._evaluate_rule") as mock_eval:
-            with patch("services.gateway.app.services.signal_runner._load_policy") as mock_policy:
-                mock_eval.return_value = [{"delivery_id": "test#1"}]
-                mock_policy.return_value = {"stale_pr": {"action": "nudge"}}
+        # Rule without name, only kind
+        rules = [{"kind": "stale_pr", "older_than_hours": 24}]
+        count = evaluate_and_log(mock_session, rules)
 
-                # Rule without name, only kind
-                rules = [{"kind": "stale_pr", "older_than_hours": 24}]
-                count = evaluate_and_log(mock_session, rules)
+        assert count == 1
 
-                assert count == 1
-
-    def test_evaluate_and_log_uses_default_action_when_policy_missing(self):
+    @patch.multiple(_sr, _evaluate_rule=DEFAULT, _load_policy=DEFAULT)
+    def test_evaluate_and_log_uses_default_action_when_policy_missing(self, **mocks):
         """Test that default 'nudge' action is used when policy doesn't specify action."""
         mock_session = Mock()
+        mocks["_evaluate_rule"].return_value = [{"delivery_id": "test#1"}]
+        # Policy doesn't have an action defined
+        mocks["_load_policy"].return_value = {"unknown_kind": {}}
+
+        rules = [{"name": "test", "kind": "unknown_kind"}]
+        count = evaluate_and_log(mock_session, rules)
+
+        assert count == 1
+        # Check that the ActionLog was created with the default action
+        logs = mock_session.execute.call_args_list[0].args[1]
+        assert logs[0]["action"] == "nudge"
+
+    @patch.multiple(
+        _sr, _evaluate_rule=DEFAULT, _load_policy=DEFAULT, get_event_bus=DEFAULT
+    )
+    async def test_evaluate_and_log_handles_event_bus_publish_failure(self, **mocks):
+        """Test that event bus publish failure doesn't crash evaluate_and_log."""
+        mock_session = Mock()
+        mocks["_evaluate_rule"].return_value = []
+        mocks["_load_policy"].return_value = {}
+        bus = mocks["get_event_bus"].return_value
+        bus.publish_json_many = Mock(side_effect=Exception("bus unavailable"))
+
+        rules = [{"kind": "test"}]
+        # Should not raise
+        count = evaluate_and_log(mock_session, rules)
+
+        assert count == 0
+        bus.publish_json_many.assert_called_once()
+
+    @patch.multiple(
+        _sr, _evaluate_rule=DEFAULT, _load_policy=DEFAULT, get_event_bus=DEFAULT
+    )
+    async def test_evaluate_and_log_publishes_one_batch_per_tick(self, **mocks):
+        """Test that a tick's events go out in a single batched publish."""
+        mocks["_evaluate_rule"].return_value = [{"delivery_id": "test#1"}]
+        mocks["_load_policy"].return_value = {}
+        bus = mocks["get_event_bus"].return_value
+        bus.publish_json_many = AsyncMock()
+
+        rules = [{"kind": "stale_pr"}, {"kind": "pr_without_review"}]
+        evaluate_and_log(Mock(), rules)
+        await asyncio.sleep(0)
+
+        bus.publish_json_many.assert_awaited_once_with(
+            subject="signals.evaluated",
+            payloads=[{"rules": ["stale_pr", "pr_without_review"], "inserted": 2}],
+        )
+        bus.publish_json.assert_not_called()
+
+    @patch.multiple(
+        _sr, _evaluate_rule=DEFAULT, _load_policy=DEFAULT, get_event_bus=DEFAULT
+    )
+    def test_evaluate_and_log_skips_publish_without_event_loop(self, **mocks):
+        """Test that the evaluator thread (no event loop) doesn't touch the bus."""
+        mocks["_evaluate_rule"].return_value = []
+        mocks["_load_policy"].return_value = {}
+
+        count = evaluate_and_log(Mock(), [{"kind": "test"}])
+
+        assert count == 0
+        mocks["get_event_bus"].assert_not_called()
+
+    @patch.multiple(_sr, _evaluate_rule=DEFAULT, _load_policy=DEFAULT)
+    def test_evaluate_and_log_loads_policy_once(self, **mocks):
+        """Test that policy is loaded once per evaluation, not per rule."""
+        mocks["_evaluate_rule"].return_value = [{"delivery_id": "test#1"}]
+        mocks["_load_policy"].return_value = {}
+
+        rules = [{"name": f"rule{i}", "kind": "stale_pr"} for i in range(100)]
+        count = evaluate_and_log(Mock(), rules)
+
+        assert count == 100
+        mocks["_load_policy"].assert_called_once()
+
+    @patch.multiple(_sr, _evaluate_rule=DEFAULT, _load_policy=DEFAULT)
+    def test_evaluate_and_log_uses_supplied_policy(self, **mocks):
+        """Test that a pre-loaded policy skips loading entirely."""
+        mock_session = Mock()
+        mocks["_evaluate_rule"].return_value = [{"delivery_id": "test#1"}]
+
+        evaluate_and_log(
+            mock_session,
+            [{"name": "test", "kind": "stale_pr"}],
+            policy={"stale_pr": {"action": "escalate"}},
+        )
 
-        with patch("services.gateway.app.services.signal_runner._evaluate_rule") as mock_eval:
-            with patch("services.gateway.app.services.signal_runner._load_policy") as mock_policy:
-                mock_eval.return_value = [{"delivery_id": "test#1"}]
-                # Policy doesn't have an action defined
-                mock_policy.return_value = {"unknown_kind": {}}
+        mocks["_load_policy"].assert_not_called()
+        logs = mock_session.execute.call_args_list[0].args[1]
+        assert logs[0]["action"] == "escalate"
 
-                rules = [{"name": "test", "kind": "unknown_kind"}]
-                count = evaluate_and_log(mock_session, rules)
+    @patch.multiple(_sr, _evaluate_rule=DEFAULT, _load_policy=DEFAULT)
+    def test_evaluate_and_log_skips_disabled_rules(self, **mocks):
+        """Test that rules with enabled: false never reach the database."""
+        mock_session = Mock()
+        mocks["_evaluate_rule"].return_value = [{"delivery_id": "test#1"}]
+        mocks["_load_policy"].return_value = {}
 
-                assert count == 1
-                # Check that ActionLog was created (can't easily inspect its action field)
-                assert mock_session.add.call_count == 2
+        rules = [
+            {"name": "off", "kind": "stale_pr", "enabled": False},
+            {"name": "on", "kind": "stale_pr"},
+        ]
+        count = evaluate_and_log(mock_session, rules)
 
-    def test_evaluate_and_log_handles_event_bus_publish_failure(self):
-        """Test that event bus publish failure doesn't crash evaluate_and_log."""
+        assert count == 1
+        mocks["_evaluate_rule"].assert_called_once_with(mock_session, rules[1])
+
+    @patch.multiple(_sr, _evaluate_rule=DEFAULT, _load_policy=DEFAULT)
+    def test_evaluate_and_log_parallel_rules_use_worker_sessions(self, **mocks):
+        """Test that each rule is evaluated once, on a session from the factory."""
         mock_session = Mock()
+        worker_session = Mock()
+        session_factory = MagicMock()
+        session_factory.return_value.__enter__.return_value = worker_session
+        mocks["_evaluate_rule"].side_effect = lambda s, rule: [
+            {"delivery_id": rule["name"]}
+        ]
+        mocks["_load_policy"].return_value = {}
+
+        rules = [{"name": f"rule{i}", "kind": "stale_pr"} for i in range(3)]
+        count = evaluate_and_log(mock_session, rules, session_factory=session_factory)
+
+        assert count == 3
+        assert mocks["_evaluate_rule"].call_count == 3
+        for call in mocks["_evaluate_rule"].call_args_list:
+            assert call.args[0] is worker_session
+        # Results are written back on the caller's session, in rule order
+        logs = mock_session.execute.call_args_list[0].args[1]
+        assert [log["subject"] for log in logs] == ["rule0", "rule1", "rule2"]
+
+
+class TestLoadPolicyCached:
+    """Test _load_policy_cached function."""
+
+    def test_load_policy_cached_reuses_unchanged_file(self, tmp_path):
+        """Test that an unchanged policy file is only loaded once."""
+        policy_file = tmp_path / "policy.yml"
+        policy_file.write_text("stale_pr:\n  action: nudge\n", encoding="utf-8")
+
+        with patch.dict(os.environ, {"POLICY_PATH": str(policy_file)}):
+            with patch.object(_sr, "_load_policy", return_value={"x": {}}) as mock_load:
+                first = _load_policy_cached()
+                second = _load_policy_cached()
 
-        with patch("services.gateway.app.services.signal_runner._evaluate_rule") as mock_eval:
-            with patch("services.gateway.app.services.signal_runner._load_policy") as mock_policy:
-                with patch("services.gateway.app.services.signal_runner.get_event_bus") as mock_bus:
-                    mock_eval.return_value = []
-                    mock_policy.return_value = {}
-                    # Simulate asyncio.create_task failing
-                    mock_bus.return_value.publish_json.side_effect = Exception("No event loop")
+                mock_load.assert_called_once()
+                assert first is second
 
-                    rules = [{"kind": "test"}]
-                    # Should not raise
-                    count = evaluate_and_log(mock_session, rules)
+    def test_load_policy_cached_missing_file_is_not_cached(self):
+        """Test that a missing policy file falls through to _load_policy each time."""
+        with patch.dict(os.environ, {"POLICY_PATH": "/nonexistent/policy.yml"}):
+            with patch.object(_sr, "_load_policy", return_value={}) as mock_load:
+                _load_policy_cached()
+                _load_policy_cached()
 
-                    assert count == 0
+                assert mock_load.call_count == 2
 
 
 class TestEvaluatorThread:
@@ -239,7 +469,7 @@ class TestEvaluatorThread:
         assert thread._session_factory == mock_factory
         assert thread._interval == 300
         assert thread.daemon is True
-        assert isinstance(thread._stop, threading.Event)
+        assert isinstance(thread._stop_event, threading.Event)
 
     def test_evaluator_thread_stop(self):
         """Test that stop() sets the stop event."""
@@ -248,7 +478,7 @@ class TestEvaluatorThread:
         thread = EvaluatorThread(mock_factory, interval_sec=60)
         thread.stop()
 
-        assert thread._stop.is_set()
+        assert thread._stop_event.is_set()
 
     def test_evaluator_thread_is_daemon(self):
         """Test that EvaluatorThread is created as daemon thread."""
@@ -258,113 +488,191 @@ class TestEvaluatorThread:
 
         assert thread.daemon is True
 
-    # Note: run() method is marked pragma: no cover, so we don't test the actual loop
+    def test_evaluator_thread_stops_promptly(self):
+        """Test that stop() wakes the loop without waiting out the interval."""
+        ran = threading.Event()
+
+        def evaluate(*_args, **_kwargs):
+            ran.set()
+            return 0
+
+        with patch.object(_sr, "evaluate_and_log", side_effect=evaluate):
+            thread = EvaluatorThread(MagicMock(), interval_sec=60)
+            thread.start()
+            assert ran.wait(timeout=1)
+            thread.stop()
+            thread.join(timeout=1)
+
+            assert not thread.is_alive()
+
+    def test_evaluator_thread_survives_cycle_error(self):
+        """Test that an exception in one cycle doesn't kill the loop."""
+        second_cycle = threading.Event()
+
+        def fail():
+            if mock_factory.call_count >= 2:
+                second_cycle.set()
+            raise RuntimeError("db down")
+
+        mock_factory = Mock(side_effect=fail)
+        # A zero interval re-runs the cycle immediately; no sleeping involved
+        thread = EvaluatorThread(mock_factory, interval_sec=0)
+        thread.start()
+        assert second_cycle.wait(timeout=1)
+        thread.stop()
+        thread.join(timeout=1)
+
+        assert not thread.is_alive()
 
 
 class TestMaybeStartEvaluator:
     """Test maybe_start_evaluator function."""
 
-    def test_maybe_start_evaluator_disabled_returns_none(self):
+    def test_maybe_start_evaluator_disabled_returns_none(self, monkeypatch):
         """Test that evaluator is not started when disabled."""
         mock_app = Mock()
         mock_factory = Mock()
 
-        with patch.dict(os.environ, {"EVALUATOR_ENABLED": "false"}):
-            result = maybe_start_evaluator(mock_app, mock_factory)
+        monkeypatch.setenv("EVALUATOR_ENABLED", "false")
+        result = maybe_start_evaluator(mock_app, mock_factory)
 
-            assert result is None
+        assert result is None
 
-    def test_maybe_start_evaluator_enabled_starts_thread(self):
+    def test_maybe_start_evaluator_enabled_starts_thread(self, monkeypatch):
         """Test that evaluator starts when enabled."""
         mock_app = Mock()
         mock_factory = Mock()
 
-        with patch.dict(os.environ, {"EVALUATOR_ENABLED": "true", "EVALUATOR_INTERVAL_SEC": "120"}):
-            with patch("services.gateway.app.services.signal_runner.EvaluatorThread.start") as mock_start:
+        monkeypatch.setenv("EVALUATOR_ENABLED", "true")
+        monkeypatch.setenv("EVALUATOR_INTERVAL_SEC", "120")
+        with patch.object(EvaluatorThread, "start") as mock_start:
+            result = maybe_start_evaluator(mock_app, mock_factory)
+
+            assert result is not None
+            assert isinstance(result, EvaluatorThread)
+            assert result._interval == 120
+            mock_start.assert_called_once()
+            assert hasattr(mock_app.state, "evaluator_thread")
+
+    def test_maybe_start_evaluator_skips_thread_without_rules(self, monkeypatch):
+        """Test that no thread is started when the rules file is empty."""
+        mock_app = Mock()
+        mock_factory = Mock()
+
+        monkeypatch.setenv("EVALUATOR_ENABLED", "true")
+        with patch.object(_sr, "_load_rules", return_value=[]):
+            with patch.object(EvaluatorThread, "start") as mock_start:
+                result = maybe_start_evaluator(mock_app, mock_factory)
+
+                assert result is None
+                mock_start.assert_not_called()
+
+    def test_maybe_start_evaluator_starts_thread_with_rules(self, monkeypatch):
+        """Test that a thread is started when rules are present."""
+        mock_app = Mock()
+        mock_factory = Mock()
+
+        monkeypatch.setenv("EVALUATOR_ENABLED", "true")
+        with patch.object(_sr, "_load_rules", return_value=_PARSED_RULES):
+            with patch.object(EvaluatorThread, "start") as mock_start:
                 result = maybe_start_evaluator(mock_app, mock_factory)
 
-                assert result is not None
                 assert isinstance(result, EvaluatorThread)
-                assert result._interval == 120
                 mock_start.assert_called_once()
-                assert hasattr(mock_app.state, "evaluator_thread")
 
-    def test_maybe_start_evaluator_respects_yes_value(self):
+    def test_maybe_start_evaluator_respects_yes_value(self, monkeypatch):
         """Test that 'yes' is recognized as enabled."""
         mock_app = Mock()
         mock_factory = Mock()
 
-        with patch.dict(os.environ, {"EVALUATOR_ENABLED": "yes"}):
-            with patch("services.gateway.app.services.signal_runner.EvaluatorThread.start"):
-                result = maybe_start_evaluator(mock_app, mock_factory)
+        monkeypatch.setenv("EVALUATOR_ENABLED", "yes")
+        with patch.object(EvaluatorThread, "start"):
+            result = maybe_start_evaluator(mock_app, mock_factory)
 
-                assert result is not None
+            assert result is not None
 
-    def test_maybe_start_evaluator_respects_1_value(self):
+    def test_maybe_start_evaluator_respects_1_value(self, monkeypatch):
         """Test that '1' is recognized as enabled."""
         mock_app = Mock()
         mock_factory = Mock()
 
-        with patch.dict(os.environ, {"EVALUATOR_ENABLED": "1"}):
-            with patch("services.gateway.app.services.signal_runner.EvaluatorThread.start"):
-                result = maybe_start_evaluator(mock_app, mock_factory)
+        monkeypatch.setenv("EVALUATOR_ENABLED", "1")
+        with patch.object(EvaluatorThread, "start"):
+            result = maybe_start_evaluator(mock_app, mock_factory)
+
+            assert result is not None
+
+    def test_maybe_start_evaluator_respects_on_value(self, monkeypatch):
+        """Test that 'on' is recognized as enabled."""
+        mock_app = Mock()
+        mock_factory = Mock()
+
+        monkeypatch.setenv("EVALUATOR_ENABLED", "on")
+        with patch.object(EvaluatorThread, "start"):
+            result = maybe_start_evaluator(mock_app, mock_factory)
 
-                assert result is not None
+            assert result is not None
 
-    def test_maybe_start_evaluator_case_insensitive(self):
+    def test_maybe_start_evaluator_case_insensitive(self, monkeypatch):
         """Test that enable check is case-insensitive."""
         mock_app = Mock()
         mock_factory = Mock()
 
-        with patch.dict(os.environ, {"EVALUATOR_ENABLED": "TRUE"}):
-            with patch("services.gateway.app.services.signal_runner.EvaluatorThread.start"):
-                result = maybe_start_evaluator(mock_app, mock_factory)
+        monkeypatch.setenv("EVALUATOR_ENABLED", "TRUE")
+        with patch.object(EvaluatorThread, "start"):
+            result = maybe_start_evaluator(mock_app, mock_factory)
 
-                assert result is not None
+            assert result is not None
 
-    def test_maybe_start_evaluator_uses_default_interval(self):
+    def test_maybe_start_evaluator_uses_default_interval(self, monkeypatch):
         """Test that default interval is 600 seconds."""
         mock_app = Mock()
         mock_factory = Mock()
 
-        with patch.dict(os.environ, {"EVALUATOR_ENABLED": "true"}, clear=True):
-            # Don't set EVALUATOR_INTERVAL_SEC, should use default
-            with patch("services.gateway.app.services.signal_runner.EvaluatorThread.start"):
-                result = maybe_start_evaluator(mock_app, mock_factory)
+        monkeypatch.setenv("EVALUATOR_ENABLED", "true")
+        # Don't set EVALUATOR_INTERVAL_SEC, should use default
+        monkeypatch.delenv("EVALUATOR_INTERVAL_SEC", raising=False)
+        with patch.object(EvaluatorThread, "start"):
+            result = maybe_start_evaluator(mock_app, mock_factory)
 
-                assert result._interval == 600
+            assert result._interval == 600
 
-    def test_maybe_start_evaluator_custom_interval(self):
+    def test_maybe_start_evaluator_custom_interval(self, monkeypatch):
         """Test custom interval from environment variable."""
         mock_app = Mock()
         mock_factory = Mock()
 
-        with patch.dict(os.environ, {"EVALUATOR_ENABLED": "true", "EVALUATOR_INTERVAL_SEC": "1800"}):
-            with patch("services.gateway.app.services.signal_runner.EvaluatorThread.start"):
-                result = maybe_start_evaluator(mock_app, mock_factory)
+        monkeypatch.setenv("EVALUATOR_ENABLED", "true")
+        monkeypatch.setenv("EVALUATOR_INTERVAL_SEC", "1800")
+        with patch.object(EvaluatorThread, "start"):
+            result = maybe_start_evaluator(mock_app, mock_factory)
 
-                assert result._interval == 1800
+            assert result._interval == 1800
 
-    def test_maybe_start_evaluator_logs_startup(self):
+    @patch.multiple(_sr, get_logger=DEFAULT)
+    @patch.object(EvaluatorThread, "start")
+    def test_maybe_start_evaluator_logs_startup(self, _mock_start, monkeypatch, **mocks):
         """Test that evaluator logs when started."""
         mock_app = Mock()
         mock_factory = Mock()
 
-        with patch.dict(os.environ, {"EVALUATOR_ENABLED": "true"}):
-            with patch("services.gateway.app.services.signal_runner.EvaluatorThread.start"):
-                with patch("services.gateway.app.services.signal_runner.get_logger") as mock_logger:
-                    mock_log_instance = Mock()
-                    mock_logger.return_value = mock_log_instance
+        monkeypatch.setenv("EVALUATOR_ENABLED", "true")
+        maybe_start_evaluator(mock_app, mock_factory)
 
-                    maybe_start_evaluator(mock_app, mock_factory)
-
-                    # Should have logged the startup
-                    mock_log_instance.info.assert_called()
+        # Should have logged the startup
+        mocks["get_logger"].return_value.info.assert_called()
 
 
 class TestDefaultRules:
     """Test default rules constant."""
 
+    def test_default_rules_are_read_only(self):
+        """Test that DEFAULT_RULES can't be mutated by callers."""
+        with pytest.raises(TypeError):
+            DEFAULT_RULES[0]["older_than_hours"] = 1
+        with pytest.raises(TypeError):
+            DEFAULT_RULES[0] = {"kind": "stale_pr"}
+
     def test_default_rules_structure(self):
         """Test that DEFAULT_RULES has expected structure."""
         assert len(DEFAULT_RULES) == 3
@@ -1,116 +1,169 @@
 """Tests for signals endpoints.
 
-Note: Many tests are skipped because the signals router uses PostgreSQL-specific
-SQL features (interval, date_trunc, regex ~) that don't work with SQLite test database.
+Note: Tests marked ``postgres`` need PostgreSQL-specific SQL features (interval,
+date_trunc, regex ~) and are deselected unless TEST_DATABASE_URL points the suite
+at a PostgreSQL database (see the root conftest).
 
 Current coverage: 76% → Target: 90%+
 """
 
+import asyncio
+import json
+from types import SimpleNamespace
+from typing import TYPE_CHECKING
+
 import pytest
-from unittest.mock import Mock, patch
+from unittest.mock import MagicMock, Mock, patch
 from fastapi.testclient import TestClient
-from sqlalchemy.orm import Session
+from httpx import ASGITransport, AsyncClient
+from pydantic import BaseModel, ConfigDict, TypeAdapter
 
+if TYPE_CHECKING:
+    from sqlalchemy.orm import Session
 
-class TestEvaluateSignals:
-    """Tests for POST /v1/signals/evaluate endpoint."""
 
-    def test_evaluate_signals_empty_rules(self, client: TestClient):
-        """Test evaluating with empty rules list."""
-        payload = {"rules": []}
+def mock_rows(rows):
+    """Stand-in for a Result whose ``.mappings()`` yields ``rows``."""
+    mappings = SimpleNamespace(
+        all=lambda: rows, first=lambda: rows[0] if rows else None
+    )
+    return SimpleNamespace(mappings=lambda: mappings)
 
-        response = client.post("/v1/signals/evaluate", json=payload)
-        assert response.status_code == 200
-        data = response.json()
-        assert data == {"results": {}}
-
-    def test_evaluate_signals_yaml_format(self, client: TestClient):
-        """Test evaluating signals with YAML input format."""
-        yaml_str = """
-- name: test_rule
-  kind: stale_pr
-  older_than_hours: 48
-"""
-        payload = {"yaml": yaml_str}
 
-        # Will fail due to PostgreSQL-specific SQL, but validates YAML parsing
-        response = client.post("/v1/signals/evaluate", json=payload)
-        # Note: May return 500 due to SQLite incompatibility with interval syntax
-        assert response.status_code in [200, 500, 503]
+EVALUATE_URL = "/v1/signals/evaluate"
+_JSON_HEADERS = {"content-type": "application/json"}
+# Fixed body for payloads with no rules; compared as bytes, spacing-tolerant
+_EMPTY_RESULTS = (b'{"results":{}}', b'{"results": {}}')
 
-    def test_evaluate_signals_json_format(self, client: TestClient):
-        """Test evaluating signals with JSON rules format."""
-        payload = {
-            "rules": [
-                {
-                    "name": "test_rule",
-                    "kind": "stale_pr",
-                    "older_than_hours": 48
-                }
-            ]
-        }
 
-        # Will fail due to PostgreSQL-specific SQL, but validates JSON parsing
-        response = client.post("/v1/signals/evaluate", json=payload)
-        # Note: May return 500 due to SQLite incompatibility
-        assert response.status_code in [200, 500, 503]
+class _RulePayload(BaseModel):
+    """Keys the signals router reads from a rule; anything else is a typo."""
 
-    def test_evaluate_signals_unsupported_kind(self, client: TestClient):
-        """Test that unsupported rule kind returns 400."""
-        payload = {
-            "rules": [
-                {
-                    "name": "invalid_rule",
-                    "kind": "unsupported_rule_type"
-                }
-            ]
-        }
+    model_config = ConfigDict(extra="forbid")
 
-        response = client.post("/v1/signals/evaluate", json=payload)
-        assert response.status_code == 400
-        assert "unsupported rule kind" in response.json()["detail"]
+    name: str | None = None
+    kind: str | None = None
+    older_than_hours: int | None = None
+    limit: int | None = None
+    ticket_pattern: str | None = None
+    enabled: bool | None = None
 
-    def test_evaluate_signals_multiple_rules(self, client: TestClient):
-        """Test evaluating multiple rules at once."""
-        payload = {
+
+# Built once; validates every case's rules before any request is made
+_RULES_ADAPTER = TypeAdapter(list[_RulePayload])
+
+
+def _encode(payloads):
+    """Validate and encode ``{id: payload}`` once, as params posted with content=."""
+    params = []
+    for case_id, payload in payloads.items():
+        if "rules" in payload:
+            _RULES_ADAPTER.validate_python(payload["rules"])
+        params.append(pytest.param(json.dumps(payload).encode(), id=case_id))
+    return params
+
+
+# Payloads that never reach SQL: nothing to evaluate
+_EMPTY_PARAMS = _encode({"empty_rules": {"rules": []}, "empty_yaml": {"yaml": ""}})
+
+# stale_pr and wip_limit_exceeded use PostgreSQL-only SQL, so under SQLite these
+# may 500; they still exercise payload parsing
+_SQL_PARAMS = _encode(
+    {
+        "yaml_format": {
+            "yaml": "- name: test_rule\n  kind: stale_pr\n  older_than_hours: 48\n"
+        },
+        "json_format": {
+            "rules": [{"name": "test_rule", "kind": "stale_pr", "older_than_hours": 48}]
+        },
+        "multiple_rules": {
             "rules": [
-                {
-                    "name": "rule1",
-                    "kind": "stale_pr",
-                    "older_than_hours": 48
-                },
-                {
-                    "name": "rule2",
-                    "kind": "wip_limit_exceeded",
-                    "limit": 5
-                }
+                {"name": "rule1", "kind": "stale_pr", "older_than_hours": 48},
+                {"name": "rule2", "kind": "wip_limit_exceeded", "limit": 5},
             ]
-        }
+        },
+    }
+)
+
+# Payloads that must all be rejected with 400 before any SQL runs
+_UNSUPPORTED_KIND_PARAMS = _encode(
+    {
+        "unsupported_kind": {
+            "rules": [{"name": "invalid", "kind": "unsupported_rule_type"}]
+        },
+        # No name: the rule falls back to its kind before failing
+        "default_name_from_kind": {"rules": [{"kind": "unsupported_for_testing"}]},
+        "missing_kind": {"rules": [{"name": "no_kind"}]},
+        "kind_is_case_sensitive": {"rules": [{"name": "upper", "kind": "STALE_PR"}]},
+        "yaml_unsupported_kind": {"yaml": "- kind: unsupported_rule_type\n"},
+    }
+)
+
+
+@pytest.fixture
+async def no_db_aclient(gateway_app):
+    """ASGI client whose DB dependency is a MagicMock, for requests that never query.
+
+    Skips building the per-test SQLite engine and session that ``aclient`` needs.
+    """
+    from services.gateway.app.api.deps import get_db_session
+
+    gateway_app.dependency_overrides[get_db_session] = lambda: MagicMock()
+    transport = ASGITransport(app=gateway_app)
+    try:
+        async with AsyncClient(transport=transport, base_url="http://testserver") as ac:
+            yield ac
+    finally:
+        gateway_app.dependency_overrides.pop(get_db_session, None)
 
-        # Will fail due to PostgreSQL-specific SQL
-        response = client.post("/v1/signals/evaluate", json=payload)
-        # Note: May return 500 due to SQLite incompatibility
+
+class TestEvaluateSignals:
+    """Tests for POST /v1/signals/evaluate endpoint."""
+
+    @pytest.mark.parametrize("body", _EMPTY_PARAMS)
+    async def test_evaluate_signals_empty(self, no_db_aclient: AsyncClient, body):
+        """Test that payloads without rules return empty results."""
+        response = await no_db_aclient.post(EVALUATE_URL, content=body, headers=_JSON_HEADERS)
+        assert response.status_code == 200
+        assert response.content in _EMPTY_RESULTS
+
+    @pytest.mark.parametrize("body", _SQL_PARAMS)
+    async def test_evaluate_signals(self, aclient: AsyncClient, body):
+        """Test POST /v1/signals/evaluate across payload shapes."""
+        response = await aclient.post(EVALUATE_URL, content=body, headers=_JSON_HEADERS)
         assert response.status_code in [200, 500, 503]
 
-    def test_evaluate_signals_default_name_from_kind(self, client: TestClient):
-        """Test that rule name defaults to kind if not provided."""
-        payload = {
-            "rules": [
-                {
-                    "kind": "unsupported_for_testing"  # Will error, but tests name fallback
-                }
-            ]
-        }
+    @pytest.mark.parametrize("body", _UNSUPPORTED_KIND_PARAMS)
+    async def test_evaluate_signals_unsupported_kind(
+        self, no_db_aclient: AsyncClient, body
+    ):
+        """Test that any unsupported or missing rule kind returns 400."""
+        response = await no_db_aclient.post(EVALUATE_URL, content=body, headers=_JSON_HEADERS)
+        assert response.status_code == 400 and b"unsupported rule kind" in response.content
 
-        response = client.post("/v1/signals/evaluate", json=payload)
-        assert response.status_code == 400
-        # Error should reference the kind as the name
-        assert "unsupported rule kind" in response.json()["detail"]
+    async def test_evaluate_signals_matrix(self, no_db_aclient: AsyncClient):
+        """Smoke-test every DB-free case concurrently in one round of requests.
 
-    @pytest.mark.skip(
-        reason="Requires PostgreSQL - uses interval syntax not supported by SQLite"
-    )
-    def test_evaluate_stale_pr_rule(self, client: TestClient, db_session: Session):
+        Cases that reach SQL are left out: they share one SQLite session, which
+        is not safe to use from concurrent requests.
+        """
+        cases = [(param.values[0], 200) for param in _EMPTY_PARAMS] + [
+            (param.values[0], 400) for param in _UNSUPPORTED_KIND_PARAMS
+        ]
+
+        responses = await asyncio.gather(
+            *(
+                no_db_aclient.post(EVALUATE_URL, content=body, headers=_JSON_HEADERS)
+                for body, _ in cases
+            )
+        )
+
+        assert tuple(r.status_code for r in responses) == tuple(
+            status for _, status in cases
+        )
+
+    @pytest.mark.postgres
+    def test_evaluate_stale_pr_rule(self, client: TestClient, db_session: "Session"):
         """Test stale_pr rule evaluation.
 
         This test would require PostgreSQL for interval support.
@@ -122,7 +175,7 @@ class TestEvaluateSignals:
             source="github",
             delivery_id="pr-123",
             event_type="pull_request",
-            payload={"action": "opened"}
+            payload=json.dumps({"action": "opened"}),
         ))
         db_session.commit()
 
@@ -140,11 +193,9 @@ class TestEvaluateSignals:
         assert response.status_code == 200
         # Would check results["stale_prs"] here
 
-    @pytest.mark.skip(
-        reason="Requires PostgreSQL - uses date_trunc not supported by SQLite"
-    )
+    @pytest.mark.postgres
     def test_evaluate_wip_limit_exceeded_rule(
-        self, client: TestClient, db_session: Session
+        self, client: TestClient, db_session: "Session"
     ):
         """Test wip_limit_exceeded rule evaluation.
 
@@ -164,11 +215,9 @@ class TestEvaluateSignals:
         assert response.status_code == 200
         # Would check if wip limit was exceeded
 
-    @pytest.mark.skip(
-        reason="Requires PostgreSQL - uses regex operator !~ not supported by SQLite"
-    )
+    @pytest.mark.postgres
     def test_evaluate_no_ticket_link_rule(
-        self, client: TestClient, db_session: Session
+        self, client: TestClient, db_session: "Session"
     ):
         """Test no_ticket_link rule evaluation.
 
@@ -188,11 +237,9 @@ class TestEvaluateSignals:
         assert response.status_code == 200
         # Would check for PRs without ticket links
 
-    @pytest.mark.skip(
-        reason="Requires PostgreSQL - uses interval syntax not supported by SQLite"
-    )
+    @pytest.mark.postgres
     def test_evaluate_pr_without_review_rule(
-        self, client: TestClient, db_session: Session
+        self, client: TestClient, db_session: "Session"
     ):
         """Test pr_without_review rule evaluation.
 
@@ -212,15 +259,6 @@ class TestEvaluateSignals:
         assert response.status_code == 200
         # Would check for PRs without reviews
 
-    def test_evaluate_signals_empty_yaml(self, client: TestClient):
-        """Test evaluating with empty YAML string."""
-        payload = {"yaml": ""}
-
-        response = client.post("/v1/signals/evaluate", json=payload)
-        assert response.status_code == 200
-        data = response.json()
-        assert data == {"results": {}}
-
     @pytest.mark.skip(
         reason="Router doesn't catch yaml.scanner.ScannerError - raises unhandled exception"
     )
@@ -239,15 +277,13 @@ class TestEvaluateSignals:
 class TestEvaluateRuleMocked:
     """Test _evaluate_rule with mocked database calls to cover SQL paths."""
 
-    def test_stale_pr_rule_with_mocked_db(self, client: TestClient, db_session: Session):
+    def test_stale_pr_rule_with_mocked_db(self, client: TestClient, db_session: "Session"):
         """Test stale_pr rule with mocked database response."""
         with patch.object(db_session, 'execute') as mock_execute:
-            mock_result = Mock()
-            mock_result.mappings.return_value.all.return_value = [
+            mock_execute.return_value = mock_rows([
                 {"delivery_id": "org/repo#123", "opened_at": "2024-01-01"},
                 {"delivery_id": "org/repo#456", "opened_at": "2024-01-02"}
-            ]
-            mock_execute.return_value = mock_result
+            ])
 
             payload = {
                 "rules": [{"name": "stale", "kind": "stale_pr", "older_than_hours": 48}]
@@ -260,15 +296,22 @@ class TestEvaluateRuleMocked:
             assert "stale" in data["results"]
             assert len(data["results"]["stale"]) == 2
 
-    def test_wip_limit_exceeded_with_mocked_db(self, client: TestClient, db_session: Session):
+            # Threshold is bound as a parameter on the module-level statement
+            from services.gateway.app.api.v1.routers.signals import _STALE_PR_SQL
+
+            stmt, params = mock_execute.call_args.args
+            assert stmt is _STALE_PR_SQL
+            assert params == {"hours": 48}
+
+    def test_wip_limit_exceeded_with_mocked_db(self, client: TestClient, db_session: "Session"):
         """Test wip_limit_exceeded rule with mocked database response."""
         with patch.object(db_session, 'execute') as mock_execute:
-            mock_result = Mock()
-            mock_result.mappings.return_value.first.return_value = {
-                "day": "2024-01-01",
-                "wip": 8
-            }
-            mock_execute.return_value = mock_result
+            mock_execute.return_value = mock_rows([
+                {
+                    "day": "2024-01-01",
+                    "wip": 8
+                }
+            ])
 
             payload = {
                 "rules": [{"name": "wip", "kind": "wip_limit_exceeded", "limit": 5}]
@@ -282,15 +325,15 @@ class TestEvaluateRuleMocked:
             assert data["results"]["wip"][0]["wip"] == 8
             assert data["results"]["wip"][0]["exceeded"] is True
 
-    def test_wip_limit_not_exceeded_with_mocked_db(self, client: TestClient, db_session: Session):
+    def test_wip_limit_not_exceeded_with_mocked_db(self, client: TestClient, db_session: "Session"):
         """Test wip_limit_exceeded when limit is not exceeded."""
         with patch.object(db_session, 'execute') as mock_execute:
-            mock_result = Mock()
-            mock_result.mappings.return_value.first.return_value = {
-                "day": "2024-01-01",
-                "wip": 3
-            }
-            mock_execute.return_value = mock_result
+            mock_execute.return_value = mock_rows([
+                {
+                    "day": "2024-01-01",
+                    "wip": 3
+                }
+            ])
 
             payload = {
                 "rules": [{"name": "wip", "kind": "wip_limit_exceeded", "limit": 5}]
@@ -302,14 +345,12 @@ class TestEvaluateRuleMocked:
             data = response.json()
             assert data["results"]["wip"][0]["exceeded"] is False
 
-    def test_no_ticket_link_rule_with_mocked_db(self, client: TestClient, db_session: Session):
+    def test_no_ticket_link_rule_with_mocked_db(self, client: TestClient, db_session: "Session"):
         """Test no_ticket_link rule with mocked database response."""
         with patch.object(db_session, 'execute') as mock_execute:
-            mock_result = Mock()
-            mock_result.mappings.return_value.all.return_value = [
+            mock_execute.return_value = mock_rows([
                 {"delivery_id": "org/repo#999", "opened_at": "2024-01-01"}
-            ]
-            mock_execute.return_value = mock_result
+            ])
 
             payload = {
                 "rules": [{"name": "no_ticket", "kind": "no_ticket_link", "ticket_pattern": "[A-Z]+-[0-9]+"}]
@@ -322,14 +363,34 @@ class TestEvaluateRuleMocked:
             assert "no_ticket" in data["results"]
             assert len(data["results"]["no_ticket"]) == 1
 
-    def test_pr_without_review_rule_with_mocked_db(self, client: TestClient, db_session: Session):
+    def test_no_ticket_link_binds_pattern_to_shared_statement(self):
+        """Test that ticket patterns are bound, not compiled or inlined per call."""
+        from services.gateway.app.api.v1.routers import signals
+
+        session = Mock()
+        session.execute.return_value = mock_rows([])
+        rule = {"kind": "no_ticket_link", "ticket_pattern": "ENG-[0-9]+"}
+
+        with patch("re.compile") as mock_compile:
+            signals._evaluate_rule(session, rule)
+            signals._evaluate_rule(session, rule)
+            signals._evaluate_rule(session, {"kind": "no_ticket_link"})
+
+        mock_compile.assert_not_called()
+        calls = session.execute.call_args_list
+        assert all(c.args[0] is signals._NO_TICKET_LINK_SQL for c in calls)
+        assert [c.args[1] for c in calls] == [
+            {"pattern": "ENG-[0-9]+"},
+            {"pattern": "ENG-[0-9]+"},
+            {"pattern": "[A-Z]+-[0-9]+"},
+        ]
+
+    def test_pr_without_review_rule_with_mocked_db(self, client: TestClient, db_session: "Session"):
         """Test pr_without_review rule with mocked database response."""
         with patch.object(db_session, 'execute') as mock_execute:
-            mock_result = Mock()
-            mock_result.mappings.return_value.all.return_value = [
+            mock_execute.return_value = mock_rows([
                 {"delivery_id": "org/repo#789", "opened_at": "2024-01-01"}
-            ]
-            mock_execute.return_value = mock_result
+            ])
 
             payload = {
                 "rules": [{"name": "no_review", "kind": "pr_without_review", "older_than_hours": 12}]
@@ -341,3 +402,44 @@ class TestEvaluateRuleMocked:
             data = response.json()
             assert "no_review" in data["results"]
             assert len(data["results"]["no_review"]) == 1
+
+
+class TestRuleDispatch:
+    """Test the rule-kind dispatch table behind _evaluate_rule."""
+
+    def test_rule_handlers_cover_supported_kinds(self):
+        """Test that every supported rule kind has a registered handler."""
+        from services.gateway.app.api.v1.routers.signals import _RULE_HANDLERS
+
+        assert set(_RULE_HANDLERS) == {
+            "stale_pr",
+            "wip_limit_exceeded",
+            "no_ticket_link",
+            "pr_without_review",
+        }
+
+    def test_rule_kind_strings_dispatch_to_enum_handlers(self):
+        """Test that plain kind strings from rule files hit the RuleKind entries."""
+        from services.gateway.app.api.v1.routers.signals import (
+            _RULE_HANDLERS,
+            RuleKind,
+        )
+
+        assert set(_RULE_HANDLERS) == set(RuleKind)
+        for kind in RuleKind:
+            assert _RULE_HANDLERS[kind.value] is _RULE_HANDLERS[kind]
+
+    def test_evaluate_rule_dispatches_through_table(self):
+        """Test that _evaluate_rule calls the handler registered for the kind."""
+        from services.gateway.app.api.v1.routers import signals
+
+        handler = Mock(return_value=[{"ok": True}])
+        session = Mock()
+        rule = {"kind": "stale_pr"}
+
+        with patch.dict(signals._RULE_HANDLERS, {"stale_pr": handler}):
+            result = signals._evaluate_rule(session, rule)
+
+        handler.assert_called_once_with(session, rule)
+        assert result == [{"ok": True}]
+        session.execute.assert_not_called()
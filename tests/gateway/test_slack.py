@@ -4,143 +4,260 @@ Tests for Slack commands router.
 Tests Slack command parsing, signature verification, and command handlers.
 Current coverage: 3% → Target: 30%+ (150+ lines)
 """
-import os
-import hashlib
+import functools
 import hmac
-import json
-import time
 import pytest
+from types import SimpleNamespace
+from hypothesis import HealthCheck, given, settings, strategies as st
 from unittest.mock import Mock, patch, MagicMock
 from fastapi import HTTPException
-from fastapi.testclient import TestClient
 
+from services.gateway.app.api.v1.routers import slack
 from services.gateway.app.api.v1.routers.slack import _verify_slack
+from services.gateway.app.models.approvals import Approval
 
 
-class TestVerifySlack:
-    """Test _verify_slack signature verification."""
+def _fake_settings(**overrides):
+    """Plain-attribute stand-in for Settings; only the Slack signing fields matter."""
+    values = {"slack_signing_required": False, "slack_signing_secret": None}
+    values.update(overrides)
+    return SimpleNamespace(**values)
 
-    def test_verify_slack_signing_not_required(self):
-        """Test that verification is skipped when signing not required."""
-        with patch("services.gateway.app.api.v1.routers.slack.get_settings") as mock_settings:
-            settings = Mock()
-            settings.slack_signing_required = False
-            mock_settings.return_value = settings
 
-            mock_request = Mock()
-            # Should not raise
-            _verify_slack(mock_request, b"body", "123456789", "v0=abc123")
+class _FakeSessionmaker:
+    """Sessionmaker whose sessions are always ``session``; never closes it."""
 
-    def test_verify_slack_missing_secret_raises_401(self):
-        """Test that missing signing secret raises 401."""
-        with patch("services.gateway.app.api.v1.routers.slack.get_settings") as mock_settings:
-            settings = Mock()
-            settings.slack_signing_required = True
-            settings.slack_signing_secret = None
-            mock_settings.return_value = settings
+    def __init__(self, session):
+        self._session = session
 
-            mock_request = Mock()
+    def __call__(self):
+        return self
 
-            with pytest.raises(HTTPException) as exc_info:
-                _verify_slack(mock_request, b"body", "123456789", "v0=abc123")
+    def __enter__(self):
+        return self._session
 
-            assert exc_info.value.status_code == 401
-            assert "slack signing secret not set" in exc_info.value.detail
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
 
-    def test_verify_slack_missing_headers_raises_401(self):
-        """Test that missing timestamp or signature raises 401."""
-        with patch("services.gateway.app.api.v1.routers.slack.get_settings") as mock_settings:
-            settings = Mock()
-            settings.slack_signing_required = True
-            settings.slack_signing_secret = "test-secret"
-            mock_settings.return_value = settings
 
-            mock_request = Mock()
+def _mock_query_chain(rows):
+    """Query mock whose filter().order_by().limit().all() returns ``rows``."""
+    query = MagicMock()
+    query.filter.return_value.order_by.return_value.limit.return_value.all.return_value = rows
+    return query
 
-            # Missing timestamp
-            with pytest.raises(HTTPException) as exc_info:
-                _verify_slack(mock_request, b"body", None, "v0=abc123")
-            assert exc_info.value.status_code == 401
-            assert "missing slack headers" in exc_info.value.detail
 
-            # Missing signature
-            with pytest.raises(HTTPException) as exc_info:
-                _verify_slack(mock_request, b"body", "123456789", None)
-            assert exc_info.value.status_code == 401
+@pytest.fixture(autouse=True)
+def slack_mocks(mocker):
+    """Patch the router's settings, sessionmaker and rule evaluator once per test.
 
-    def test_verify_slack_bad_timestamp_raises_401(self):
-        """Test that non-numeric timestamp raises 401."""
-        with patch("services.gateway.app.api.v1.routers.slack.get_settings") as mock_settings:
-            settings = Mock()
-            settings.slack_signing_required = True
-            settings.slack_signing_secret = "test-secret"
-            mock_settings.return_value = settings
+    Tests tweak the returned mocks (e.g. ``slack_mocks.eval.return_value``)
+    instead of opening their own patch() blocks. TestVerifySlack layers its
+    own settings on top.
+    """
+    settings = _fake_settings()
+    mocker.patch.object(slack, "get_settings", return_value=settings)
 
-            mock_request = Mock()
+    session = Mock()
+    sessionmaker = mocker.patch.object(
+        slack, "get_sessionmaker", return_value=_FakeSessionmaker(session)
+    )
 
-            with pytest.raises(HTTPException) as exc_info:
-                _verify_slack(mock_request, b"body", "not-a-number", "v0=abc123")
+    evaluate = mocker.patch.object(slack, "_evaluate_rule", return_value=[])
+    return SimpleNamespace(
+        settings=settings, sessionmaker=sessionmaker, session=session, eval=evaluate
+    )
 
-            assert exc_info.value.status_code == 401
-            assert "bad timestamp" in exc_info.value.detail
 
-    def test_verify_slack_old_timestamp_raises_401(self):
-        """Test that old timestamp (>5 min) raises 401."""
-        with patch("services.gateway.app.api.v1.routers.slack.get_settings") as mock_settings:
-            settings = Mock()
-            settings.slack_signing_required = True
-            settings.slack_signing_secret = "test-secret"
-            mock_settings.return_value = settings
+# Replaced at call time with a valid signature for the request
+_SIGNED = "<signed>"
+_FIXED_TS = "1700000000"
 
-            mock_request = Mock()
 
-            # Timestamp from 10 minutes ago
-            old_ts = str(int(time.time()) - 600)
+@functools.lru_cache(maxsize=32)
+def _sig(secret: bytes, ts: str, body: bytes) -> str:
+    """Slack v0 signature for ``body``; cached since inputs repeat across cases."""
+    digest = hmac.digest(secret, b"v0:%s:%s" % (ts.encode(), body), "sha256")
+    return f"v0={digest.hex()}"
 
-            with pytest.raises(HTTPException) as exc_info:
-                _verify_slack(mock_request, b"body", old_ts, "v0=abc123")
 
-            assert exc_info.value.status_code == 401
-            assert "timestamp too old" in exc_info.value.detail
+@pytest.fixture(scope="class")
+def valid_sig():
+    """One correctly signed request, shared by every test in a class."""
+    body = b"test body"
+    secret = b"test-secret"
+    return SimpleNamespace(
+        body=body, ts=_FIXED_TS, secret=secret, sig=_sig(secret, _FIXED_TS, body)
+    )
 
-    def test_verify_slack_invalid_signature_raises_401(self):
-        """Test that invalid signature raises 401."""
-        with patch("services.gateway.app.api.v1.routers.slack.get_settings") as mock_settings:
-            settings = Mock()
-            settings.slack_signing_required = True
-            settings.slack_signing_secret = "test-secret"
-            mock_settings.return_value = settings
 
-            mock_request = Mock()
-            ts = str(int(time.time()))
-            body = b"test body"
+@pytest.fixture(autouse=True)
+def clear_verified_cache():
+    """Start every test without remembered verifications or keyed HMACs."""
+    slack._VERIFIED.clear()
+    slack._HMAC_TEMPLATES.clear()
+    yield
+    slack._VERIFIED.clear()
+    slack._HMAC_TEMPLATES.clear()
 
-            # Invalid signature
-            with pytest.raises(HTTPException) as exc_info:
-                _verify_slack(mock_request, body, ts, "v0=invalid_signature")
 
-            assert exc_info.value.status_code == 401
-            assert "invalid signature" in exc_info.value.detail
+@pytest.fixture(autouse=True)
+def frozen_time(monkeypatch):
+    """Pin the router's clock to _FIXED_TS so timestamps and signatures are constant."""
+    monkeypatch.setattr(slack, "time", SimpleNamespace(time=lambda: float(_FIXED_TS)))
 
-    def test_verify_slack_valid_signature_passes(self):
-        """Test that valid signature passes verification."""
-        with patch("services.gateway.app.api.v1.routers.slack.get_settings") as mock_settings:
-            settings = Mock()
-            settings.slack_signing_required = True
-            settings.slack_signing_secret = "test-secret"
-            mock_settings.return_value = settings
 
-            mock_request = Mock()
-            ts = str(int(time.time()))
-            body = b"test body"
-
-            # Compute valid signature
-            basestring = f"v0:{ts}:{body.decode()}".encode()
-            mac = hmac.new(settings.slack_signing_secret.encode(), basestring, hashlib.sha256)
-            valid_sig = f"v0={mac.hexdigest()}"
+class TestVerifySlack:
+    """Test _verify_slack signature verification."""
 
+    @pytest.mark.parametrize(
+        "required,secret,ts,sig,status,detail",
+        [
+            (False, None, "123456789", "v0=abc123", None, None),
+            (True, None, "123456789", "v0=abc123", 401, "slack signing secret not set"),
+            (True, "test-secret", None, "v0=abc123", 401, "missing slack headers"),
+            (True, "test-secret", "123456789", None, 401, "missing slack headers"),
+            (True, "test-secret", "not-a-number", "v0=abc123", 401, "bad timestamp"),
+            # Ten minutes before the frozen clock
+            (True, "test-secret", "1699999400", "v0=abc123", 401, "timestamp too old"),
+            (True, "test-secret", _FIXED_TS, "v0=invalid_signature", 401, "invalid signature"),
+            (True, "test-secret", _FIXED_TS, "v0=" + "zz" * 32, 401, "invalid signature"),
+            (True, "test-secret", _FIXED_TS, "v1=" + "00" * 32, 401, "invalid signature"),
+            (True, "test-secret", _FIXED_TS, _SIGNED, None, None),
+        ],
+        ids=[
+            "signing_not_required",
+            "missing_secret",
+            "missing_timestamp",
+            "missing_signature",
+            "bad_timestamp",
+            "old_timestamp",
+            "invalid_signature",
+            "malformed_hex_signature",
+            "wrong_version_prefix",
+            "valid_signature",
+        ],
+    )
+    def test_verify_slack(
+        self, monkeypatch, valid_sig, required, secret, ts, sig, status, detail
+    ):
+        """Test each verification branch: pass, or 401 with the expected detail."""
+        monkeypatch.setattr(
+            slack,
+            "get_settings",
+            lambda: _fake_settings(
+                slack_signing_required=required, slack_signing_secret=secret
+            ),
+        )
+        body = valid_sig.body
+        if sig == _SIGNED:
+            sig = valid_sig.sig
+
+        if status is None:
             # Should not raise
-            _verify_slack(mock_request, body, ts, valid_sig)
+            _verify_slack(object(), body, ts, sig)
+            return
+        with pytest.raises(HTTPException) as exc_info:
+            _verify_slack(object(), body, ts, sig)
+        assert exc_info.value.status_code == status
+        assert detail in exc_info.value.detail
+
+    @pytest.mark.parametrize(
+        "mangle",
+        [
+            lambda sig: "v0=" + sig[3:].upper(),
+            lambda sig: sig[:35] + " " + sig[35:],
+            lambda sig: sig + "\n",
+        ],
+        ids=["uppercase_hex", "embedded_space", "trailing_newline"],
+    )
+    def test_verify_slack_rejects_non_canonical_hex(
+        self, monkeypatch, valid_sig, mangle
+    ):
+        """Test that a signature decoding to the right bytes must still be canonical."""
+        self._signed_settings(monkeypatch)
+
+        with pytest.raises(HTTPException) as exc_info:
+            _verify_slack(object(), valid_sig.body, valid_sig.ts, mangle(valid_sig.sig))
+        assert exc_info.value.detail == "invalid signature"
+
+    def _signed_settings(self, monkeypatch, secret="test-secret"):
+        monkeypatch.setattr(
+            slack,
+            "get_settings",
+            lambda: _fake_settings(slack_signing_required=True, slack_signing_secret=secret),
+        )
+
+    def test_verify_slack_retry_skips_hmac(self, monkeypatch, valid_sig):
+        """Test that a retried delivery is verified without recomputing the HMAC."""
+        self._signed_settings(monkeypatch)
+
+        with patch.object(slack, "_signing_mac", wraps=slack._signing_mac) as mock_mac:
+            _verify_slack(object(), valid_sig.body, valid_sig.ts, valid_sig.sig)
+            _verify_slack(object(), valid_sig.body, valid_sig.ts, valid_sig.sig)
+
+        assert mock_mac.call_count == 1
+
+    def test_verify_slack_accepts_non_utf8_body(self, monkeypatch):
+        """Test that the body is signed as raw bytes, never decoded."""
+        self._signed_settings(monkeypatch)
+        body = b"\xff\xfe payload"
+
+        # Should not raise
+        _verify_slack(object(), body, _FIXED_TS, _sig(b"test-secret", _FIXED_TS, body))
+
+    def test_verify_slack_keys_hmac_once_per_secret(self, monkeypatch):
+        """Test that the keyed HMAC is built once and copied for later requests."""
+        self._signed_settings(monkeypatch)
+        bodies = [f"body {i}".encode() for i in range(5)]
+
+        with patch.object(slack.hmac, "new", wraps=slack.hmac.new) as mock_new:
+            for body in bodies:
+                _verify_slack(object(), body, _FIXED_TS, _sig(b"test-secret", _FIXED_TS, body))
+
+        assert mock_new.call_count == 1
+
+    def test_verify_slack_failures_are_not_remembered(self, monkeypatch, valid_sig):
+        """Test that a rejected signature is re-checked, and a different body is not a hit."""
+        self._signed_settings(monkeypatch)
+        _verify_slack(object(), valid_sig.body, valid_sig.ts, valid_sig.sig)
+
+        for _ in range(2):
+            with pytest.raises(HTTPException):
+                _verify_slack(object(), b"tampered body", valid_sig.ts, valid_sig.sig)
+
+    # monkeypatch/frozen_time only install constant settings and a constant
+    # clock, so sharing them across examples is safe
+    @settings(
+        max_examples=30,
+        deadline=None,
+        derandomize=True,
+        suppress_health_check=[HealthCheck.function_scoped_fixture],
+    )
+    @given(offset=st.integers(-1000, 1000), tamper=st.booleans())
+    def test_verify_slack_property(self, monkeypatch, valid_sig, offset, tamper):
+        """Test that a request passes iff it is fresh (within 5 min) and untampered."""
+        self._signed_settings(monkeypatch)
+        ts = str(int(_FIXED_TS) + offset)
+        sig = "v0=" + "0" * 64 if tamper else _sig(valid_sig.secret, ts, valid_sig.body)
+
+        if abs(offset) <= 300 and not tamper:
+            _verify_slack(object(), valid_sig.body, ts, sig)
+        else:
+            with pytest.raises(HTTPException) as exc_info:
+                _verify_slack(object(), valid_sig.body, ts, sig)
+            assert exc_info.value.status_code == 401
+
+    def test_verify_slack_rotated_secret_is_not_a_hit(self, monkeypatch):
+        """Test that verifications remembered under an old secret don't carry over."""
+        body = b"test body"
+        sig = _sig(b"old-secret", _FIXED_TS, body)
+        self._signed_settings(monkeypatch, secret="old-secret")
+        _verify_slack(object(), body, _FIXED_TS, sig)
+
+        self._signed_settings(monkeypatch, secret="new-secret")
+        with pytest.raises(HTTPException):
+            _verify_slack(object(), body, _FIXED_TS, sig)
 
 
 class TestSlackCommands:
@@ -148,443 +265,270 @@ class TestSlackCommands:
 
     def test_commands_empty_text_returns_usage(self, client):
         """Test that empty command text returns usage message."""
-        with patch("services.gateway.app.api.v1.routers.slack.get_settings") as mock_settings:
-            settings = Mock()
-            settings.slack_signing_required = False
-            mock_settings.return_value = settings
+        # Empty payload
+        response = client.post(
+            "/v1/slack/commands",
+            data={"text": ""}
+        )
 
-            # Empty payload
-            response = client.post(
-                "/v1/slack/commands",
-                content=b"text=",
-                headers={"content-type": "application/x-www-form-urlencoded"}
-            )
-
-            assert response.status_code == 200
-            data = response.json()
-            assert data["ok"] is True
-            assert "Usage" in data["message"]
+        assert response.status_code == 200
+        data = response.json()
+        assert data["ok"] is True
+        assert "Usage" in data["message"]
 
     def test_commands_no_text_returns_usage(self, client):
         """Test that missing text field returns usage message."""
-        with patch("services.gateway.app.api.v1.routers.slack.get_settings") as mock_settings:
-            settings = Mock()
-            settings.slack_signing_required = False
-            mock_settings.return_value = settings
+        response = client.post(
+            "/v1/slack/commands",
+            data={"user_id": "U123"}
+        )
 
-            response = client.post(
-                "/v1/slack/commands",
-                content=b"user_id=U123",
-                headers={"content-type": "application/x-www-form-urlencoded"}
-            )
-
-            assert response.status_code == 200
-            data = response.json()
-            assert data["ok"] is True
-            assert "Usage" in data["message"]
+        assert response.status_code == 200
+        data = response.json()
+        assert data["ok"] is True
+        assert "Usage" in data["message"]
 
-    def test_commands_parses_form_encoded_payload(self, client):
+    def test_commands_parses_form_encoded_payload(self, client, slack_mocks):
         """Test that commands endpoint parses form-encoded payload."""
-        with patch("services.gateway.app.api.v1.routers.slack.get_settings") as mock_settings:
-            with patch("services.gateway.app.api.v1.routers.slack.get_sessionmaker") as mock_sessionmaker:
-                with patch("services.gateway.app.api.v1.routers.slack._evaluate_rule") as mock_eval:
-                    settings = Mock()
-                    settings.slack_signing_required = False
-                    mock_settings.return_value = settings
+        slack_mocks.eval.return_value = []
 
-                    mock_session = Mock()
-                    mock_sessionmaker.return_value.return_value.__enter__.return_value = mock_session
-                    mock_sessionmaker.return_value.return_value.__exit__.return_value = None
+        response = client.post(
+            "/v1/slack/commands",
+            data={"text": "signals stale_pr"}
+        )
 
-                    mock_eval.return_value = []
+        assert response.status_code == 200
 
-                    response = client.post(
-                        "/v1/slack/commands",
-                        content=b"text=signals+stale_pr",
-                        headers={"content-type": "application/x-www-form-urlencoded"}
-                    )
-
-                    assert response.status_code == 200
-
-    def test_commands_parses_json_payload(self, client):
+    def test_commands_parses_json_payload(self, client, slack_mocks):
         """Test that commands endpoint parses JSON payload."""
-        with patch("services.gateway.app.api.v1.routers.slack.get_settings") as mock_settings:
-            with patch("services.gateway.app.api.v1.routers.slack.get_sessionmaker") as mock_sessionmaker:
-                with patch("services.gateway.app.api.v1.routers.slack._evaluate_rule") as mock_eval:
-                    settings = Mock()
-                    settings.slack_signing_required = False
-                    mock_settings.return_value = settings
+        slack_mocks.eval.return_value = []
 
-                    mock_session = Mock()
-                    mock_sessionmaker.return_value.return_value.__enter__.return_value = mock_session
-                    mock_sessionmaker.return_value.return_value.__exit__.return_value = None
+        response = client.post(
+            "/v1/slack/commands",
+            json={"text": "signals stale_pr"}
+        )
 
-                    mock_eval.return_value = []
+        assert response.status_code == 200
 
-                    response = client.post(
-                        "/v1/slack/commands",
-                        json={"text": "signals stale_pr"},
-                        headers={"content-type": "application/json"}
-                    )
 
-                    assert response.status_code == 200
+def _results_by_kind(session, rule):
+    kind = rule["kind"]
+    if kind == "stale_pr":
+        return [{"delivery_id": "org/repo#123"}]
+    elif kind == "wip_limit_exceeded":
+        return []
+    else:
+        return [{"subject": "test"}]
 
 
 class TestSlackSignalsCommand:
     """Test 'signals' command."""
 
-    def test_signals_command_default_kinds(self, client):
-        """Test signals command with default kinds."""
-        with patch("services.gateway.app.api.v1.routers.slack.get_settings") as mock_settings:
-            with patch("services.gateway.app.api.v1.routers.slack.get_sessionmaker") as mock_sessionmaker:
-                with patch("services.gateway.app.api.v1.routers.slack._evaluate_rule") as mock_eval:
-                    settings = Mock()
-                    settings.slack_signing_required = False
-                    mock_settings.return_value = settings
-
-                    mock_session = Mock()
-                    mock_sessionmaker.return_value.return_value.__enter__.return_value = mock_session
-                    mock_sessionmaker.return_value.return_value.__exit__.return_value = None
-
-                    # Mock results for different kinds
-                    def eval_side_effect(session, rule):
-                        kind = rule["kind"]
-                        if kind == "stale_pr":
-                            return [{"delivery_id": "org/repo#123"}]
-                        elif kind == "wip_limit_exceeded":
-                            return []
-                        else:
-                            return [{"subject": "test"}]
-
-                    mock_eval.side_effect = eval_side_effect
-
-                    response = client.post(
-                        "/v1/slack/commands",
-                        content=b"text=signals",
-                        headers={"content-type": "application/x-www-form-urlencoded"}
-                    )
-
-                    assert response.status_code == 200
-                    data = response.json()
-                    assert data["ok"] is True
-                    # Should evaluate all 3 default kinds
-                    assert "stale_pr" in data["message"]
-                    assert "wip_limit_exceeded" in data["message"]
-                    assert "pr_without_review" in data["message"]
-
-    def test_signals_command_specific_kind(self, client):
-        """Test signals command with specific kind."""
-        with patch("services.gateway.app.api.v1.routers.slack.get_settings") as mock_settings:
-            with patch("services.gateway.app.api.v1.routers.slack.get_sessionmaker") as mock_sessionmaker:
-                with patch("services.gateway.app.api.v1.routers.slack._evaluate_rule") as mock_eval:
-                    settings = Mock()
-                    settings.slack_signing_required = False
-                    mock_settings.return_value = settings
-
-                    mock_session = Mock()
-                    mock_sessionmaker.return_value.return_value.__enter__.return_value = mock_session
-                    mock_sessionmaker.return_value.return_value.__exit__.return_value = None
-
-                    mock_eval.return_value = [
-                        {"delivery_id": "org/repo#123"},
-                        {"delivery_id": "org/repo#124"}
-                    ]
-
-                    response = client.post(
-                        "/v1/slack/commands",
-                        content=b"text=signals+stale_pr",
-                        headers={"content-type": "application/x-www-form-urlencoded"}
-                    )
-
-                    assert response.status_code == 200
-                    data = response.json()
-                    assert data["ok"] is True
-                    assert "stale_pr: 2 found" in data["message"]
-
-    def test_signals_command_handles_eval_error(self, client):
-        """Test signals command handles evaluation error."""
-        with patch("services.gateway.app.api.v1.routers.slack.get_settings") as mock_settings:
-            with patch("services.gateway.app.api.v1.routers.slack.get_sessionmaker") as mock_sessionmaker:
-                with patch("services.gateway.app.api.v1.routers.slack._evaluate_rule") as mock_eval:
-                    settings = Mock()
-                    settings.slack_signing_required = False
-                    mock_settings.return_value = settings
-
-                    mock_session = Mock()
-                    mock_sessionmaker.return_value.return_value.__enter__.return_value = mock_session
-                    mock_sessionmaker.return_value.return_value.__exit__.return_value = None
-
-                    # Simulate error
-                    mock_eval.side_effect = HTTPException(status_code=400, detail="Invalid rule")
-
-                    response = client.post(
-                        "/v1/slack/commands",
-                        content=b"text=signals+bad_kind",
-                        headers={"content-type": "application/x-www-form-urlencoded"}
-                    )
-
-                    assert response.status_code == 200
-                    data = response.json()
-                    assert data["ok"] is True
-                    assert "error" in data["message"]
+    @pytest.mark.parametrize(
+        "text,eval_effect,expected",
+        [
+            # Should evaluate all 3 default kinds
+            (
+                "signals",
+                _results_by_kind,
+                ["stale_pr", "wip_limit_exceeded", "pr_without_review"],
+            ),
+            (
+                "signals stale_pr",
+                lambda session, rule: [
+                    {"delivery_id": "org/repo#123"},
+                    {"delivery_id": "org/repo#124"},
+                ],
+                ["stale_pr: 2 found"],
+            ),
+            # Evaluation errors are reported inline, not raised
+            (
+                "signals bad_kind",
+                HTTPException(status_code=400, detail="Invalid rule"),
+                ["error"],
+            ),
+        ],
+        ids=["default_kinds", "specific_kind", "eval_error"],
+    )
+    def test_signals_command(self, client, slack_mocks, text, eval_effect, expected):
+        """Test signals command output for each evaluation outcome."""
+        slack_mocks.eval.side_effect = eval_effect
+
+        response = client.post(
+            "/v1/slack/commands",
+            data={"text": text}
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["ok"] is True
+        for fragment in expected:
+            assert fragment in data["message"]
 
 
 class TestSlackApprovalsCommand:
     """Test 'approvals' command."""
 
-    def test_approvals_command_no_pending(self, client, db_session):
+    def test_approvals_command_no_pending(self, client, slack_mocks, db_session):
         """Test approvals command with no pending approvals."""
-        with patch("services.gateway.app.api.v1.routers.slack.get_settings") as mock_settings:
-            with patch("services.gateway.app.api.v1.routers.slack.get_sessionmaker") as mock_sessionmaker:
-                settings = Mock()
-                settings.slack_signing_required = False
-                mock_settings.return_value = settings
+        slack_mocks.sessionmaker.return_value = _FakeSessionmaker(db_session)
 
-                mock_sessionmaker.return_value.return_value.__enter__.return_value = db_session
-                mock_sessionmaker.return_value.return_value.__exit__.return_value = None
+        response = client.post(
+            "/v1/slack/commands",
+            data={"text": "approvals"}
+        )
 
-                response = client.post(
-                    "/v1/slack/commands",
-                    content=b"text=approvals",
-                    headers={"content-type": "application/x-www-form-urlencoded"}
-                )
-
-                assert response.status_code == 200
-                data = response.json()
-                assert data["ok"] is True
-                assert "No pending approvals" in data["message"]
+        assert response.status_code == 200
+        data = response.json()
+        assert data["ok"] is True
+        assert "No pending approvals" in data["message"]
 
 
 class TestSlackApproveDeclineCommand:
     """Test 'approve' and 'decline' commands."""
 
-    def test_approve_command_success(self, client):
-        """Test approve command with valid approval ID."""
-        with patch("services.gateway.app.api.v1.routers.slack.get_settings") as mock_settings:
-            with patch("services.gateway.app.api.v1.routers.slack.approvals_decide") as mock_decide:
-                settings = Mock()
-                settings.slack_signing_required = False
-                mock_settings.return_value = settings
-
-                mock_decide.return_value = {"status": "approved", "job_id": "workflow-123"}
-
-                response = client.post(
-                    "/v1/slack/commands",
-                    content=b"text=approve+42",
-                    headers={"content-type": "application/x-www-form-urlencoded"}
-                )
-
-                assert response.status_code == 200
-                data = response.json()
-                assert data["ok"] is True
-                assert "approval #42 approved" in data["message"]
-                assert "job_id=workflow-123" in data["message"]
-                mock_decide.assert_called_once_with(42, {"decision": "approve", "reason": "slack"})
-
-    def test_decline_command_success(self, client):
-        """Test decline command with valid approval ID."""
-        with patch("services.gateway.app.api.v1.routers.slack.get_settings") as mock_settings:
-            with patch("services.gateway.app.api.v1.routers.slack.approvals_decide") as mock_decide:
-                settings = Mock()
-                settings.slack_signing_required = False
-                mock_settings.return_value = settings
-
-                mock_decide.return_value = {"status": "declined"}
-
-                response = client.post(
-                    "/v1/slack/commands",
-                    content=b"text=decline+99",
-                    headers={"content-type": "application/x-www-form-urlencoded"}
-                )
-
-                assert response.status_code == 200
-                data = response.json()
-                assert data["ok"] is True
-                assert "approval #99 declined" in data["message"]
-                mock_decide.assert_called_once_with(99, {"decision": "decline", "reason": "slack"})
+    @pytest.mark.parametrize(
+        "text,decided,expected,call",
+        [
+            (
+                "approve 42",
+                {"status": "approved", "job_id": "workflow-123"},
+                ["approval #42 approved", "job_id=workflow-123"],
+                (42, {"decision": "approve", "reason": "slack"}),
+            ),
+            (
+                "decline 99",
+                {"status": "declined"},
+                ["approval #99 declined"],
+                (99, {"decision": "decline", "reason": "slack"}),
+            ),
+        ],
+        ids=["approve", "decline"],
+    )
+    def test_decision_command_success(self, client, mocker, text, decided, expected, call):
+        """Test approve/decline commands with a valid approval ID."""
+        mock_decide = mocker.patch.object(slack, "approvals_decide", return_value=decided)
+
+        response = client.post(
+            "/v1/slack/commands",
+            data={"text": text}
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["ok"] is True
+        for fragment in expected:
+            assert fragment in data["message"]
+        mock_decide.assert_called_once_with(*call)
 
     def test_approve_command_invalid_format_returns_usage(self, client):
         """Test approve command with invalid format returns usage."""
-        with patch("services.gateway.app.api.v1.routers.slack.get_settings") as mock_settings:
-            settings = Mock()
-            settings.slack_signing_required = False
-            mock_settings.return_value = settings
-
-            # Missing approval ID - falls through to usage message
-            response = client.post(
-                "/v1/slack/commands",
-                content=b"text=approve",
-                headers={"content-type": "application/x-www-form-urlencoded"}
-            )
+        # Missing approval ID - falls through to usage message
+        response = client.post(
+            "/v1/slack/commands",
+            data={"text": "approve"}
+        )
 
-            assert response.status_code == 200
-            assert "Usage" in response.json()["message"]
+        assert response.status_code == 200
+        assert "Usage" in response.json()["message"]
 
     def test_approve_command_non_numeric_id_raises_400(self, client):
         """Test approve command with non-numeric ID raises 400."""
-        with patch("services.gateway.app.api.v1.routers.slack.get_settings") as mock_settings:
-            settings = Mock()
-            settings.slack_signing_required = False
-            mock_settings.return_value = settings
+        response = client.post(
+            "/v1/slack/commands",
+            data={"text": "approve abc"}
+        )
 
-            response = client.post(
-                "/v1/slack/commands",
-                content=b"text=approve+abc",
-                headers={"content-type": "application/x-www-form-urlencoded"}
-            )
-
-            assert response.status_code == 400
+        assert response.status_code == 400
 
 
 class TestSlackApprovalsPostCommand:
     """Test 'approvals post' command."""
 
-    def test_approvals_post_with_pending(self, client, db_session):
+    def test_approvals_post_with_pending(self, client, slack_mocks, db_session):
         """Test approvals post command with pending approvals."""
-        from services.gateway.app.models.approvals import Approval
-
-        with patch("services.gateway.app.api.v1.routers.slack.get_settings") as mock_settings:
-            with patch("services.gateway.app.api.v1.routers.slack.get_sessionmaker") as mock_sessionmaker:
-                with patch("services.gateway.app.services.slack_client.SlackClient") as mock_slack:
-                    settings = Mock()
-                    settings.slack_signing_required = False
-                    mock_settings.return_value = settings
-
-                    # Create mock approvals
-                    approval1 = Approval(id=1, action="deploy", subject="v1.0.0", status="pending")
-                    approval2 = Approval(id=2, action="merge", subject="PR#123", status="pending")
-
-                    mock_query = Mock()
-                    mock_filter = Mock()
-                    mock_order = Mock()
-                    mock_limit = Mock()
-
-                    mock_query.filter.return_value = mock_filter
-                    mock_filter.order_by.return_value = mock_order
-                    mock_order.limit.return_value = mock_limit
-                    mock_limit.all.return_value = [approval1, approval2]
-
-                    mock_session = Mock()
-                    mock_session.query.return_value = mock_query
-
-                    mock_sessionmaker.return_value.return_value.__enter__.return_value = mock_session
-                    mock_sessionmaker.return_value.return_value.__exit__.return_value = None
-
-                    mock_slack_instance = Mock()
-                    mock_slack_instance.post_blocks.return_value = {"ok": True, "ts": "123.456"}
-                    mock_slack.return_value = mock_slack_instance
-
-                    response = client.post(
-                        "/v1/slack/commands",
-                        content=b"text=approvals+post+%23channel",
-                        headers={"content-type": "application/x-www-form-urlencoded"}
-                    )
-
-                    assert response.status_code == 200
-                    data = response.json()
-                    assert data["ok"] is True
-                    assert "posted" in data
-                    mock_slack_instance.post_blocks.assert_called_once()
-
-    def test_approvals_post_no_pending(self, client, db_session):
-        """Test approvals post command with no pending approvals."""
-        with patch("services.gateway.app.api.v1.routers.slack.get_settings") as mock_settings:
-            with patch("services.gateway.app.api.v1.routers.slack.get_sessionmaker") as mock_sessionmaker:
-                settings = Mock()
-                settings.slack_signing_required = False
-                mock_settings.return_value = settings
+        with patch("services.gateway.app.services.slack_client.SlackClient") as mock_slack:
+            # Create mock approvals
+            approval1 = Approval(id=1, action="deploy", subject="v1.0.0", status="pending")
+            approval2 = Approval(id=2, action="merge", subject="PR#123", status="pending")
+
+            slack_mocks.session.query.return_value = _mock_query_chain([approval1, approval2])
 
-                mock_query = Mock()
-                mock_filter = Mock()
-                mock_order = Mock()
-                mock_limit = Mock()
+            mock_slack_instance = Mock()
+            mock_slack_instance.post_blocks.return_value = {"ok": True, "ts": "123.456"}
+            mock_slack.return_value = mock_slack_instance
 
-                mock_query.filter.return_value = mock_filter
-                mock_filter.order_by.return_value = mock_order
-                mock_order.limit.return_value = mock_limit
-                mock_limit.all.return_value = []
+            response = client.post(
+                "/v1/slack/commands",
+                data={"text": "approvals post #channel"}
+            )
 
-                mock_session = Mock()
-                mock_session.query.return_value = mock_query
+            assert response.status_code == 200
+            data = response.json()
+            assert data["ok"] is True
+            assert "posted" in data
+            mock_slack_instance.post_blocks.assert_called_once()
 
-                mock_sessionmaker.return_value.return_value.__enter__.return_value = mock_session
-                mock_sessionmaker.return_value.return_value.__exit__.return_value = None
+    def test_approvals_post_no_pending(self, client, slack_mocks, db_session):
+        """Test approvals post command with no pending approvals."""
+        slack_mocks.session.query.return_value = _mock_query_chain([])
 
-                response = client.post(
-                    "/v1/slack/commands",
-                    content=b"text=approvals+post",
-                    headers={"content-type": "application/x-www-form-urlencoded"}
-                )
+        response = client.post(
+            "/v1/slack/commands",
+            data={"text": "approvals post"}
+        )
 
-                assert response.status_code == 200
-                data = response.json()
-                assert data["ok"] is True
-                assert "No pending approvals" in data["message"]
+        assert response.status_code == 200
+        data = response.json()
+        assert data["ok"] is True
+        assert "No pending approvals" in data["message"]
 
 
 class TestSlackStandupCommand:
     """Test 'standup' command."""
 
-    def test_standup_command_default_hours(self, client):
-        """Test standup command with default 48 hours."""
-        with patch("services.gateway.app.api.v1.routers.slack.get_settings") as mock_settings:
-            with patch("services.gateway.app.api.v1.routers.slack.get_sessionmaker") as mock_sessionmaker:
-                with patch("services.gateway.app.api.v1.routers.slack.build_standup") as mock_build:
-                    settings = Mock()
-                    settings.slack_signing_required = False
-                    mock_settings.return_value = settings
-
-                    mock_session = Mock()
-                    mock_sessionmaker.return_value.return_value.__enter__.return_value = mock_session
-                    mock_sessionmaker.return_value.return_value.__exit__.return_value = None
-
-                    mock_build.return_value = {
-                        "stale_pr_count": 5,
-                        "stale_pr_top": ["PR#123", "PR#124"],
-                        "wip_open_prs": 10,
-                        "pr_without_review_count": 3,
-                        "deployments_last_24h": 2
-                    }
-
-                    response = client.post(
-                        "/v1/slack/commands",
-                        content=b"text=standup",
-                        headers={"content-type": "application/x-www-form-urlencoded"}
-                    )
-
-                    assert response.status_code == 200
-                    data = response.json()
-                    assert data["ok"] is True
-                    assert "stale_prs:5" in data["message"]
-                    assert "wip:10" in data["message"]
-
-    def test_standup_command_custom_hours(self, client):
-        """Test standup command with custom hours."""
-        with patch("services.gateway.app.api.v1.routers.slack.get_settings") as mock_settings:
-            with patch("services.gateway.app.api.v1.routers.slack.get_sessionmaker") as mock_sessionmaker:
-                with patch("services.gateway.app.api.v1.routers.slack.build_standup") as mock_build:
-                    settings = Mock()
-                    settings.slack_signing_required = False
-                    mock_settings.return_value = settings
-
-                    mock_session = Mock()
-                    mock_sessionmaker.return_value.return_value.__enter__.return_value = mock_session
-                    mock_sessionmaker.return_value.return_value.__exit__.return_value = None
-
-                    mock_build.return_value = {
-                        "stale_pr_count": 0,
-                        "stale_pr_top": [],
-                        "wip_open_prs": 0,
-                        "pr_without_review_count": 0,
-                        "deployments_last_24h": 0
-                    }
-
-                    response = client.post(
-                        "/v1/slack/commands",
-                        content=b"text=standup+24",
-                        headers={"content-type": "application/x-www-form-urlencoded"}
-                    )
-
-                    assert response.status_code == 200
-                    # Should call build_standup with 24
-                    mock_build.assert_called_once_with(mock_session, 24)
+    @pytest.mark.parametrize(
+        "text,hours,report,expected",
+        [
+            (
+                "standup",
+                48,
+                {
+                    "stale_pr_count": 5,
+                    "stale_pr_top": ["PR#123", "PR#124"],
+                    "wip_open_prs": 10,
+                    "pr_without_review_count": 3,
+                    "deployments_last_24h": 2
+                },
+                ["stale_prs:5", "wip:10"],
+            ),
+            (
+                "standup 24",
+                24,
+                {
+                    "stale_pr_count": 0,
+                    "stale_pr_top": [],
+                    "wip_open_prs": 0,
+                    "pr_without_review_count": 0,
+                    "deployments_last_24h": 0
+                },
+                ["stale_prs:0", "wip:0"],
+            ),
+        ],
+        ids=["default_hours", "custom_hours"],
+    )
+    def test_standup_command(self, client, slack_mocks, mocker, text, hours, report, expected):
+        """Test standup command builds the report for the requested window."""
+        mock_build = mocker.patch.object(slack, "build_standup", return_value=report)
+
+        response = client.post(
+            "/v1/slack/commands",
+            data={"text": text}
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["ok"] is True
+        for fragment in expected:
+            assert fragment in data["message"]
+        mock_build.assert_called_once_with(slack_mocks.session, hours)
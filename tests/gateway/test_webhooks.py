@@ -1,135 +1,313 @@
 """Tests for webhooks endpoints."""
 
+import functools
 import hashlib
 import hmac
 import json
+import uuid
 
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy import func, insert, select
 from sqlalchemy.orm import Session
 
+from services.gateway.app.models.events import EventRaw
 
-def _compute_github_signature(secret: str, body: bytes) -> str:
-    """Compute GitHub webhook signature."""
-    mac = hmac.new(secret.encode("utf-8"), msg=body, digestmod=hashlib.sha256)
-    return "sha256=" + mac.hexdigest()
+try:
+    from orjson import loads as _json_loads
+except ImportError:  # orjson is a dev extra; conftest uses it for json= bodies too
+    _json_loads = json.loads
 
+# Bodies reused across tests, serialized once; post them with ``content=``
+_JSON_CONTENT = {"content-type": "application/json"}
+_PR_OPENED = json.dumps({"action": "opened"}).encode()
+_MALFORMED = json.dumps({"something": "else"}).encode()
 
-class TestGitHubWebhook:
-    """Tests for POST /webhooks/github endpoint."""
 
-    def test_github_webhook_basic_success(
-        self, client: TestClient, db_session: Session
-    ):
-        """Test basic GitHub webhook reception."""
-        from services.gateway.app.models.events import EventRaw
+def _seed_events(db_session: Session, *rows: dict) -> list[int]:
+    """Insert EventRaw rows in a single executemany and return their ids."""
+    return db_session.scalars(
+        insert(EventRaw).returning(EventRaw.id, sort_by_parameter_order=True),
+        list(rows),
+    ).all()
 
-        # Clean events
-        db_session.query(EventRaw).delete()
-        db_session.commit()
 
-        payload = {"action": "opened", "pull_request": {"id": 123}}
-        headers = {
+@functools.lru_cache(maxsize=128)
+def _compute_github_signature(secret: str, body: bytes) -> str:
+    """Compute GitHub webhook signature (cached; bodies are module constants)."""
+    mac = hmac.new(secret.encode("utf-8"), msg=body, digestmod=hashlib.sha256)
+    return "sha256=" + mac.digest().hex()
+
+
+# Plain column select for assertions; rows come back as named tuples
+_EVENT_COLUMNS = select(
+    EventRaw.source,
+    EventRaw.event_type,
+    EventRaw.delivery_id,
+    EventRaw.payload,
+    EventRaw.headers,
+    EventRaw.signature,
+)
+
+# Header-supplied delivery ids are random so tests never depend on which ids
+# other tests used; payload-derived ids (Linear, PagerDuty) stay literal
+_GITHUB_PAYLOAD_DELIVERY = uuid.uuid4().hex
+_JIRA_PAYLOAD_DELIVERY = uuid.uuid4().hex
+
+_BASIC_CASES = [
+    pytest.param(
+        "/webhooks/github",
+        {"X-GitHub-Event": "pull_request", "X-GitHub-Delivery": uuid.uuid4().hex},
+        {"action": "opened", "pull_request": {"id": 123}},
+        id="github_pull_request",
+    ),
+    pytest.param(
+        "/webhooks/github",
+        {"X-GitHub-Event": "issues", "X-GitHub-Delivery": uuid.uuid4().hex},
+        {
+            "action": "opened",
+            "issue": {
+                "number": 42,
+                "title": "Add authentication feature",
+                "state": "open",
+                "labels": [{"name": "feature"}],
+                "assignee": {"login": "alice"},
+            },
+            "repository": {"name": "em-agent", "owner": {"login": "evanhourigan"}},
+        },
+        id="github_issues_opened",
+    ),
+    pytest.param(
+        "/webhooks/jira",
+        {"X-Atlassian-Webhook-Identifier": uuid.uuid4().hex},
+        {"webhookEvent": "jira:issue_created", "issue": {"id": "10000"}},
+        id="jira",
+    ),
+    pytest.param(
+        "/webhooks/linear",
+        {"Linear-Signature": "sha256=test"},
+        {
+            "action": "create",
+            "type": "Issue",
+            "data": {
+                "id": "abc-123",
+                "identifier": "ENG-42",
+                "title": "Add authentication",
+                "description": "Implement OAuth2 flow",
+                "state": {"id": "state-123", "name": "In Progress"},
+                "team": {"id": "team-123", "name": "Engineering"},
+                "assignee": {"id": "user-123", "name": "Alice"},
+            },
+            "url": "https://linear.app/issue/ENG-42",
+            "createdAt": "2025-11-09T10:00:00.000Z",
+        },
+        id="linear_issue_create",
+    ),
+    pytest.param(
+        "/webhooks/pagerduty",
+        {"X-PagerDuty-Signature": "sha256=test"},
+        {
+            "event": {
+                "id": "event-123",
+                "event_type": "incident.triggered",
+                "resource_type": "incident",
+                "occurred_at": "2025-11-09T10:00:00Z",
+                "data": {
+                    "id": "P123ABC",
+                    "incident_number": 42,
+                    "title": "Database high CPU usage",
+                    "status": "triggered",
+                    "urgency": "high",
+                    "service": {"summary": "Production Database"},
+                },
+            }
+        },
+        id="pagerduty_incident_triggered",
+    ),
+]
+
+_STORES_PAYLOAD_CASES = [
+    pytest.param(
+        "/webhooks/github",
+        {
             "X-GitHub-Event": "pull_request",
-            "X-GitHub-Delivery": "12345-67890-abcdef",
-        }
+            "X-GitHub-Delivery": _GITHUB_PAYLOAD_DELIVERY,
+        },
+        {"action": "opened", "number": 42, "title": "Test PR"},
+        "github",
+        "pull_request",
+        _GITHUB_PAYLOAD_DELIVERY,
+        id="github",
+    ),
+    pytest.param(
+        "/webhooks/jira",
+        {"X-Atlassian-Webhook-Identifier": _JIRA_PAYLOAD_DELIVERY},
+        {
+            "webhookEvent": "jira:issue_created",
+            "issue": {"id": "10001", "key": "PROJ-123"},
+        },
+        "jira",
+        "unknown",  # Jira doesn't extract event_type
+        _JIRA_PAYLOAD_DELIVERY,
+        id="jira",
+    ),
+    pytest.param(
+        "/webhooks/linear",
+        {},
+        {
+            "action": "update",
+            "type": "Issue",
+            "data": {
+                "id": "payload-test",
+                "identifier": "ENG-99",
+                "title": "Test payload storage",
+                "priority": 1,
+            },
+        },
+        "linear",
+        "Issue:update",
+        "linear-Issue-update-payload-test",
+        id="linear",
+    ),
+    pytest.param(
+        "/webhooks/pagerduty",
+        {},
+        {
+            "event": {
+                "event_type": "incident.escalated",
+                "data": {
+                    "id": "PTEST999",
+                    "incident_number": 999,
+                    "title": "Test payload storage",
+                    "urgency": "high",
+                    "priority": {"summary": "P1"},
+                },
+            }
+        },
+        "pagerduty",
+        "incident.escalated",
+        "pagerduty-incident.escalated-PTEST999",
+        id="pagerduty",
+    ),
+]
 
-        response = client.post("/webhooks/github", json=payload, headers=headers)
+
+class TestWebhookStoresEvent:
+    """Behaviour shared by the GitHub, Jira, Linear and PagerDuty endpoints."""
+
+    @pytest.mark.parametrize("endpoint,headers,payload", _BASIC_CASES)
+    def test_webhook_basic_success(
+        self, client: TestClient, endpoint, headers, payload
+    ):
+        """Test that a delivery is accepted and gets an event id.
+
+        Persistence is covered by test_webhook_stores_payload.
+        """
+        response = client.post(endpoint, json=payload, headers=headers)
         assert response.status_code == 200
         data = response.json()
         assert data["status"] == "ok"
-        assert "id" in data
+        assert isinstance(data["id"], int)
 
-        # Verify event was stored
-        event = (
-            db_session.query(EventRaw)
-            .filter_by(delivery_id="12345-67890-abcdef")
-            .first()
-        )
-        assert event is not None
-        assert event.source == "github"
-        assert event.event_type == "pull_request"
-        assert event.delivery_id == "12345-67890-abcdef"
+    @pytest.mark.parametrize(
+        "endpoint,headers,payload,expected_source,expected_event_type,delivery_id",
+        _STORES_PAYLOAD_CASES,
+    )
+    def test_webhook_stores_payload(
+        self,
+        client: TestClient,
+        db_session: Session,
+        endpoint,
+        headers,
+        payload,
+        expected_source,
+        expected_event_type,
+        delivery_id,
+    ):
+        """Test that the event and its full request payload are stored."""
+        response = client.post(endpoint, json=payload, headers=headers)
+        assert response.status_code == 200
+
+        event = db_session.execute(
+            _EVENT_COLUMNS.filter_by(delivery_id=delivery_id)
+        ).one()
+        assert event.source == expected_source
+        assert event.event_type == expected_event_type
+        # The raw body is stored, so it parses back to exactly what was sent
+        assert _json_loads(event.payload) == payload
+
+
+class TestGitHubWebhook:
+    """Tests for POST /webhooks/github endpoint."""
 
     def test_github_webhook_duplicate_delivery(
         self, client: TestClient, db_session: Session
     ):
         """Test that duplicate delivery IDs are rejected."""
-        from services.gateway.app.models.events import EventRaw
-
-        # Clean and create existing event
-        db_session.query(EventRaw).delete()
-        existing = EventRaw(
-            source="github",
-            event_type="pull_request",
-            delivery_id="duplicate-123",
-            payload=json.dumps({"test": "data"}),
+        delivery_id = uuid.uuid4().hex
+        # Create existing event
+        (existing_id,) = _seed_events(
+            db_session,
+            {
+                "source": "github",
+                "event_type": "pull_request",
+                "delivery_id": delivery_id,
+                "payload": json.dumps({"test": "data"}),
+            },
         )
-        db_session.add(existing)
-        db_session.commit()
-        existing_id = existing.id
 
         # Try to send duplicate
-        payload = {"action": "opened"}
         headers = {
             "X-GitHub-Event": "pull_request",
-            "X-GitHub-Delivery": "duplicate-123",  # Duplicate
+            "X-GitHub-Delivery": delivery_id,  # Duplicate
         }
 
-        response = client.post("/webhooks/github", json=payload, headers=headers)
+        response = client.post(
+            "/webhooks/github", content=_PR_OPENED, headers={**headers, **_JSON_CONTENT}
+        )
         assert response.status_code == 200
         data = response.json()
         assert data["status"] == "duplicate"
         assert data["id"] == existing_id
 
-        # Verify no new event was created
-        count = (
-            db_session.query(EventRaw).filter_by(delivery_id="duplicate-123").count()
-        )
-        assert count == 1
+        # Verify no new event was created; LIMIT 2 is enough to spot a second row
+        ids = db_session.scalars(
+            select(EventRaw.id).filter_by(delivery_id=delivery_id).limit(2)
+        ).all()
+        assert ids == [existing_id]
 
     def test_github_webhook_without_delivery_id(
         self, client: TestClient, db_session: Session
     ):
         """Test webhook without X-GitHub-Delivery header."""
-        from services.gateway.app.models.events import EventRaw
-
-        # Clean events
-        db_session.query(EventRaw).delete()
-        db_session.commit()
-
-        payload = {"action": "opened"}
         headers = {"X-GitHub-Event": "pull_request"}
 
-        response = client.post("/webhooks/github", json=payload, headers=headers)
+        response = client.post(
+            "/webhooks/github", content=_PR_OPENED, headers={**headers, **_JSON_CONTENT}
+        )
         assert response.status_code == 200
         data = response.json()
         assert data["status"] == "ok"
 
         # Event stored with empty delivery_id
-        event = db_session.query(EventRaw).filter_by(source="github").first()
-        assert event is not None
+        event = db_session.execute(_EVENT_COLUMNS.filter_by(source="github")).one()
         assert event.delivery_id == ""
 
     def test_github_webhook_without_event_type(
         self, client: TestClient, db_session: Session
     ):
         """Test webhook without X-GitHub-Event header."""
-        from services.gateway.app.models.events import EventRaw
-
-        # Clean events
-        db_session.query(EventRaw).delete()
-        db_session.commit()
-
+        delivery_id = uuid.uuid4().hex
         payload = {"action": "test"}
-        headers = {"X-GitHub-Delivery": "test-123"}
+        headers = {"X-GitHub-Delivery": delivery_id}
 
         response = client.post("/webhooks/github", json=payload, headers=headers)
         assert response.status_code == 200
 
         # Event stored with "unknown" event_type
-        event = db_session.query(EventRaw).filter_by(delivery_id="test-123").first()
-        assert event is not None
+        event = db_session.execute(
+            _EVENT_COLUMNS.filter_by(delivery_id=delivery_id)
+        ).one()
         assert event.event_type == "unknown"
 
     @pytest.mark.skip(
@@ -142,24 +320,20 @@ class TestGitHubWebhook:
 
         TODO: Requires setting app.state.github_webhook_secret in test setup.
         """
-        from services.gateway.app.models.events import EventRaw
-
-        db_session.query(EventRaw).delete()
-        db_session.commit()
-
+        delivery_id = uuid.uuid4().hex
         secret = "test-secret"
-        payload = {"action": "opened"}
-        body = json.dumps(payload).encode("utf-8")
-        signature = _compute_github_signature(secret, body)
+        signature = _compute_github_signature(secret, _PR_OPENED)
 
         headers = {
             "X-GitHub-Event": "pull_request",
-            "X-GitHub-Delivery": "signed-123",
+            "X-GitHub-Delivery": delivery_id,
             "X-Hub-Signature-256": signature,
         }
 
         # Would need to configure client app state with github_webhook_secret
-        response = client.post("/webhooks/github", json=payload, headers=headers)
+        response = client.post(
+            "/webhooks/github", content=_PR_OPENED, headers={**headers, **_JSON_CONTENT}
+        )
         assert response.status_code == 200
 
     @pytest.mark.skip(
@@ -170,14 +344,16 @@ class TestGitHubWebhook:
 
         TODO: Requires setting app.state.github_webhook_secret in test setup.
         """
-        payload = {"action": "opened"}
+        delivery_id = uuid.uuid4().hex
         headers = {
             "X-GitHub-Event": "pull_request",
-            "X-GitHub-Delivery": "invalid-sig-123",
+            "X-GitHub-Delivery": delivery_id,
             "X-Hub-Signature-256": "sha256=invalid_signature_here",
         }
 
-        response = client.post("/webhooks/github", json=payload, headers=headers)
+        response = client.post(
+            "/webhooks/github", content=_PR_OPENED, headers={**headers, **_JSON_CONTENT}
+        )
         assert response.status_code == 401
         assert "invalid signature" in response.json()["detail"]
 
@@ -185,112 +361,31 @@ class TestGitHubWebhook:
         self, client: TestClient, db_session: Session
     ):
         """Test that webhook stores request headers."""
-        from services.gateway.app.models.events import EventRaw
-
-        db_session.query(EventRaw).delete()
-        db_session.commit()
-
+        delivery_id = uuid.uuid4().hex
         payload = {"test": "data"}
         headers = {
             "X-GitHub-Event": "push",
-            "X-GitHub-Delivery": "headers-test-123",
+            "X-GitHub-Delivery": delivery_id,
             "Custom-Header": "custom-value",
         }
 
         response = client.post("/webhooks/github", json=payload, headers=headers)
         assert response.status_code == 200
 
-        event = (
-            db_session.query(EventRaw).filter_by(delivery_id="headers-test-123").first()
-        )
-        assert event is not None
-        assert event.headers is not None
+        event = db_session.execute(
+            _EVENT_COLUMNS.filter_by(delivery_id=delivery_id)
+        ).one()
         assert isinstance(event.headers, dict)
         # Check that our custom header was stored
-        assert "custom-header" in str(event.headers).lower()
-
-    def test_github_webhook_stores_payload(
-        self, client: TestClient, db_session: Session
-    ):
-        """Test that webhook stores the full payload."""
-        from services.gateway.app.models.events import EventRaw
-
-        db_session.query(EventRaw).delete()
-        db_session.commit()
-
-        payload = {"action": "opened", "number": 42, "title": "Test PR"}
-        headers = {
-            "X-GitHub-Event": "pull_request",
-            "X-GitHub-Delivery": "payload-test-123",
-        }
-
-        response = client.post("/webhooks/github", json=payload, headers=headers)
-        assert response.status_code == 200
-
-        event = (
-            db_session.query(EventRaw).filter_by(delivery_id="payload-test-123").first()
-        )
-        assert event is not None
-        assert event.payload is not None
-        # Payload should contain our test data
-        assert "opened" in event.payload
-        assert "42" in event.payload or 42 in json.loads(event.payload)
+        assert "custom-header" in {k.lower() for k in event.headers}
 
 
 class TestGitHubIssuesWebhook:
     """Tests for GitHub Issues events via POST /webhooks/github endpoint."""
 
-    def test_github_issues_opened_event(self, client: TestClient, db_session: Session):
-        """Test GitHub issues 'opened' event."""
-        from services.gateway.app.models.events import EventRaw
-
-        # Clean events
-        db_session.query(EventRaw).delete()
-        db_session.commit()
-
-        payload = {
-            "action": "opened",
-            "issue": {
-                "number": 42,
-                "title": "Add authentication feature",
-                "state": "open",
-                "labels": [{"name": "feature"}],
-                "assignee": {"login": "alice"},
-            },
-            "repository": {"name": "em-agent", "owner": {"login": "evanhourigan"}},
-        }
-        headers = {"X-GitHub-Event": "issues", "X-GitHub-Delivery": "issues-opened-123"}
-
-        response = client.post("/webhooks/github", json=payload, headers=headers)
-        assert response.status_code == 200
-        data = response.json()
-        assert data["status"] == "ok"
-        assert "id" in data
-
-        # Verify event was stored
-        event = (
-            db_session.query(EventRaw)
-            .filter_by(delivery_id="issues-opened-123")
-            .first()
-        )
-        assert event is not None
-        assert event.source == "github"
-        assert event.event_type == "issues"
-        assert event.delivery_id == "issues-opened-123"
-
-        # Verify payload contains issue data
-        assert "42" in event.payload or 42 in json.loads(event.payload).get(
-            "issue", {}
-        ).get("number", 0)
-        assert "authentication" in event.payload.lower()
-
     def test_github_issues_closed_event(self, client: TestClient, db_session: Session):
         """Test GitHub issues 'closed' event."""
-        from services.gateway.app.models.events import EventRaw
-
-        db_session.query(EventRaw).delete()
-        db_session.commit()
-
+        delivery_id = uuid.uuid4().hex
         payload = {
             "action": "closed",
             "issue": {
@@ -300,31 +395,24 @@ class TestGitHubIssuesWebhook:
             },
             "repository": {"name": "em-agent", "owner": {"login": "evanhourigan"}},
         }
-        headers = {"X-GitHub-Event": "issues", "X-GitHub-Delivery": "issues-closed-123"}
+        headers = {"X-GitHub-Event": "issues", "X-GitHub-Delivery": delivery_id}
 
         response = client.post("/webhooks/github", json=payload, headers=headers)
         assert response.status_code == 200
 
-        event = (
-            db_session.query(EventRaw)
-            .filter_by(delivery_id="issues-closed-123")
-            .first()
-        )
-        assert event is not None
+        event = db_session.execute(
+            _EVENT_COLUMNS.filter_by(delivery_id=delivery_id)
+        ).one()
         assert event.event_type == "issues"
 
         # Verify action is in payload
-        payload_data = json.loads(event.payload)
+        payload_data = _json_loads(event.payload)
         assert payload_data["action"] == "closed"
         assert payload_data["issue"]["state"] == "closed"
 
     def test_github_issues_labeled_event(self, client: TestClient, db_session: Session):
         """Test GitHub issues 'labeled' event."""
-        from services.gateway.app.models.events import EventRaw
-
-        db_session.query(EventRaw).delete()
-        db_session.commit()
-
+        delivery_id = uuid.uuid4().hex
         payload = {
             "action": "labeled",
             "issue": {
@@ -336,18 +424,15 @@ class TestGitHubIssuesWebhook:
         }
         headers = {
             "X-GitHub-Event": "issues",
-            "X-GitHub-Delivery": "issues-labeled-123",
+            "X-GitHub-Delivery": delivery_id,
         }
 
         response = client.post("/webhooks/github", json=payload, headers=headers)
         assert response.status_code == 200
 
-        event = (
-            db_session.query(EventRaw)
-            .filter_by(delivery_id="issues-labeled-123")
-            .first()
-        )
-        assert event is not None
+        event = db_session.execute(
+            _EVENT_COLUMNS.filter_by(delivery_id=delivery_id)
+        ).one()
         assert event.event_type == "issues"
         assert "bug" in event.payload
 
@@ -355,11 +440,7 @@ class TestGitHubIssuesWebhook:
         self, client: TestClient, db_session: Session
     ):
         """Test GitHub issues 'assigned' event."""
-        from services.gateway.app.models.events import EventRaw
-
-        db_session.query(EventRaw).delete()
-        db_session.commit()
-
+        delivery_id = uuid.uuid4().hex
         payload = {
             "action": "assigned",
             "issue": {"number": 42, "assignee": {"login": "alice"}},
@@ -367,71 +448,40 @@ class TestGitHubIssuesWebhook:
         }
         headers = {
             "X-GitHub-Event": "issues",
-            "X-GitHub-Delivery": "issues-assigned-123",
+            "X-GitHub-Delivery": delivery_id,
         }
 
         response = client.post("/webhooks/github", json=payload, headers=headers)
         assert response.status_code == 200
 
-        event = (
-            db_session.query(EventRaw)
-            .filter_by(delivery_id="issues-assigned-123")
-            .first()
-        )
-        assert event is not None
+        event = db_session.execute(
+            _EVENT_COLUMNS.filter_by(delivery_id=delivery_id)
+        ).one()
         assert "alice" in event.payload
 
 
 class TestJiraWebhook:
     """Tests for POST /webhooks/jira endpoint."""
 
-    def test_jira_webhook_basic_success(self, client: TestClient, db_session: Session):
-        """Test basic Jira webhook reception."""
-        from services.gateway.app.models.events import EventRaw
-
-        # Clean events
-        db_session.query(EventRaw).delete()
-        db_session.commit()
-
-        payload = {"webhookEvent": "jira:issue_created", "issue": {"id": "10000"}}
-        headers = {"X-Atlassian-Webhook-Identifier": "jira-webhook-123"}
-
-        response = client.post("/webhooks/jira", json=payload, headers=headers)
-        assert response.status_code == 200
-        data = response.json()
-        assert data["status"] == "ok"
-        assert "id" in data
-
-        # Verify event was stored
-        event = (
-            db_session.query(EventRaw).filter_by(delivery_id="jira-webhook-123").first()
-        )
-        assert event is not None
-        assert event.source == "jira"
-        assert event.event_type == "unknown"  # Jira doesn't extract event_type
-        assert event.delivery_id == "jira-webhook-123"
-
     def test_jira_webhook_duplicate_delivery(
         self, client: TestClient, db_session: Session
     ):
         """Test that duplicate Jira webhook identifiers are rejected."""
-        from services.gateway.app.models.events import EventRaw
-
-        # Clean and create existing event
-        db_session.query(EventRaw).delete()
-        existing = EventRaw(
-            source="jira",
-            event_type="unknown",
-            delivery_id="jira-duplicate-456",
-            payload=json.dumps({"test": "data"}),
+        delivery_id = uuid.uuid4().hex
+        # Create existing event
+        (existing_id,) = _seed_events(
+            db_session,
+            {
+                "source": "jira",
+                "event_type": "unknown",
+                "delivery_id": delivery_id,
+                "payload": json.dumps({"test": "data"}),
+            },
         )
-        db_session.add(existing)
-        db_session.commit()
-        existing_id = existing.id
 
         # Try to send duplicate
         payload = {"webhookEvent": "jira:issue_updated"}
-        headers = {"X-Atlassian-Webhook-Identifier": "jira-duplicate-456"}
+        headers = {"X-Atlassian-Webhook-Identifier": delivery_id}
 
         response = client.post("/webhooks/jira", json=payload, headers=headers)
         assert response.status_code == 200
@@ -439,24 +489,16 @@ class TestJiraWebhook:
         assert data["status"] == "duplicate"
         assert data["id"] == existing_id
 
-        # Verify no new event was created
-        count = (
-            db_session.query(EventRaw)
-            .filter_by(delivery_id="jira-duplicate-456")
-            .count()
-        )
-        assert count == 1
+        # Verify no new event was created; LIMIT 2 is enough to spot a second row
+        ids = db_session.scalars(
+            select(EventRaw.id).filter_by(delivery_id=delivery_id).limit(2)
+        ).all()
+        assert ids == [existing_id]
 
     def test_jira_webhook_without_identifier(
         self, client: TestClient, db_session: Session
     ):
         """Test Jira webhook without X-Atlassian-Webhook-Identifier header."""
-        from services.gateway.app.models.events import EventRaw
-
-        # Clean events
-        db_session.query(EventRaw).delete()
-        db_session.commit()
-
         payload = {"webhookEvent": "jira:issue_created"}
 
         response = client.post("/webhooks/jira", json=payload)
@@ -465,110 +507,31 @@ class TestJiraWebhook:
         assert data["status"] == "ok"
 
         # Event stored with empty delivery_id
-        event = db_session.query(EventRaw).filter_by(source="jira").first()
-        assert event is not None
+        event = db_session.execute(_EVENT_COLUMNS.filter_by(source="jira")).one()
         assert event.delivery_id == ""
 
-    def test_jira_webhook_stores_payload(self, client: TestClient, db_session: Session):
-        """Test that Jira webhook stores the full payload."""
-        from services.gateway.app.models.events import EventRaw
-
-        db_session.query(EventRaw).delete()
-        db_session.commit()
-
-        payload = {
-            "webhookEvent": "jira:issue_created",
-            "issue": {"id": "10001", "key": "PROJ-123"},
-        }
-        headers = {"X-Atlassian-Webhook-Identifier": "jira-payload-test"}
-
-        response = client.post("/webhooks/jira", json=payload, headers=headers)
-        assert response.status_code == 200
-
-        event = (
-            db_session.query(EventRaw)
-            .filter_by(delivery_id="jira-payload-test")
-            .first()
-        )
-        assert event is not None
-        assert event.payload is not None
-        # Payload should contain our test data
-        assert "PROJ-123" in event.payload
-
     def test_jira_webhook_no_signature_field(
         self, client: TestClient, db_session: Session
     ):
         """Test that Jira webhooks have null signature."""
-        from services.gateway.app.models.events import EventRaw
-
-        db_session.query(EventRaw).delete()
-        db_session.commit()
-
+        delivery_id = uuid.uuid4().hex
         payload = {"test": "data"}
-        headers = {"X-Atlassian-Webhook-Identifier": "jira-sig-test"}
+        headers = {"X-Atlassian-Webhook-Identifier": delivery_id}
 
         response = client.post("/webhooks/jira", json=payload, headers=headers)
         assert response.status_code == 200
 
-        event = (
-            db_session.query(EventRaw).filter_by(delivery_id="jira-sig-test").first()
-        )
-        assert event is not None
+        event = db_session.execute(
+            _EVENT_COLUMNS.filter_by(delivery_id=delivery_id)
+        ).one()
         assert event.signature is None  # Jira webhooks don't have signatures
 
 
 class TestLinearWebhook:
     """Tests for POST /webhooks/linear endpoint."""
 
-    def test_linear_webhook_issue_create(self, client: TestClient, db_session: Session):
-        """Test Linear issue create event."""
-        from services.gateway.app.models.events import EventRaw
-
-        # Clean events
-        db_session.query(EventRaw).delete()
-        db_session.commit()
-
-        payload = {
-            "action": "create",
-            "type": "Issue",
-            "data": {
-                "id": "abc-123",
-                "identifier": "ENG-42",
-                "title": "Add authentication",
-                "description": "Implement OAuth2 flow",
-                "state": {"id": "state-123", "name": "In Progress"},
-                "team": {"id": "team-123", "name": "Engineering"},
-                "assignee": {"id": "user-123", "name": "Alice"},
-            },
-            "url": "https://linear.app/issue/ENG-42",
-            "createdAt": "2025-11-09T10:00:00.000Z",
-        }
-        headers = {"Linear-Signature": "sha256=test"}
-
-        response = client.post("/webhooks/linear", json=payload, headers=headers)
-        assert response.status_code == 200
-        data = response.json()
-        assert data["status"] == "ok"
-        assert "id" in data
-
-        # Verify event was stored
-        event = db_session.query(EventRaw).filter_by(source="linear").first()
-        assert event is not None
-        assert event.source == "linear"
-        assert event.event_type == "Issue:create"
-        assert "linear-Issue-create-abc-123" in event.delivery_id
-
-        # Verify payload contains issue data
-        assert "ENG-42" in event.payload
-        assert "authentication" in event.payload.lower()
-
     def test_linear_webhook_issue_update(self, client: TestClient, db_session: Session):
         """Test Linear issue update event."""
-        from services.gateway.app.models.events import EventRaw
-
-        db_session.query(EventRaw).delete()
-        db_session.commit()
-
         payload = {
             "action": "update",
             "type": "Issue",
@@ -584,8 +547,7 @@ class TestLinearWebhook:
         response = client.post("/webhooks/linear", json=payload)
         assert response.status_code == 200
 
-        event = db_session.query(EventRaw).filter_by(source="linear").first()
-        assert event is not None
+        event = db_session.execute(_EVENT_COLUMNS.filter_by(source="linear")).one()
         assert event.event_type == "Issue:update"
         assert "Done" in event.payload
 
@@ -593,11 +555,6 @@ class TestLinearWebhook:
         self, client: TestClient, db_session: Session
     ):
         """Test Linear comment create event."""
-        from services.gateway.app.models.events import EventRaw
-
-        db_session.query(EventRaw).delete()
-        db_session.commit()
-
         payload = {
             "action": "create",
             "type": "Comment",
@@ -611,8 +568,7 @@ class TestLinearWebhook:
         response = client.post("/webhooks/linear", json=payload)
         assert response.status_code == 200
 
-        event = db_session.query(EventRaw).filter_by(source="linear").first()
-        assert event is not None
+        event = db_session.execute(_EVENT_COLUMNS.filter_by(source="linear")).one()
         assert event.event_type == "Comment:create"
         assert "looks good" in event.payload.lower()
 
@@ -620,22 +576,19 @@ class TestLinearWebhook:
         self, client: TestClient, db_session: Session
     ):
         """Test that duplicate Linear webhook deliveries are rejected."""
-        from services.gateway.app.models.events import EventRaw
-
-        # Clean and create existing event
-        db_session.query(EventRaw).delete()
+        # Create existing event
         payload_data = json.dumps(
             {"action": "create", "type": "Issue", "data": {"id": "duplicate-123"}}
         )
-        existing = EventRaw(
-            source="linear",
-            event_type="Issue:create",
-            delivery_id="linear-Issue-create-duplicate-123",
-            payload=payload_data,
+        (existing_id,) = _seed_events(
+            db_session,
+            {
+                "source": "linear",
+                "event_type": "Issue:create",
+                "delivery_id": "linear-Issue-create-duplicate-123",
+                "payload": payload_data,
+            },
         )
-        db_session.add(existing)
-        db_session.commit()
-        existing_id = existing.id
 
         # Try to send duplicate
         payload = {"action": "create", "type": "Issue", "data": {"id": "duplicate-123"}}
@@ -646,21 +599,16 @@ class TestLinearWebhook:
         assert data["status"] == "duplicate"
         assert data["id"] == existing_id
 
-        # Verify no new event was created
-        count = (
-            db_session.query(EventRaw)
+        # Verify no new event was created; LIMIT 2 is enough to spot a second row
+        ids = db_session.scalars(
+            select(EventRaw.id)
             .filter_by(delivery_id="linear-Issue-create-duplicate-123")
-            .count()
-        )
-        assert count == 1
+            .limit(2)
+        ).all()
+        assert ids == [existing_id]
 
     def test_linear_webhook_without_data(self, client: TestClient, db_session: Session):
         """Test Linear webhook with malformed payload uses fallback delivery_id."""
-        from services.gateway.app.models.events import EventRaw
-
-        db_session.query(EventRaw).delete()
-        db_session.commit()
-
         # Malformed payload (no data field)
         payload = {"action": "create"}
 
@@ -668,101 +616,20 @@ class TestLinearWebhook:
         assert response.status_code == 200
 
         # Should create event with timestamp-based delivery_id
-        event = db_session.query(EventRaw).filter_by(source="linear").first()
-        assert event is not None
+        event = db_session.execute(_EVENT_COLUMNS.filter_by(source="linear")).one()
         assert event.delivery_id.startswith("linear-")
         assert (
             event.event_type == "unknown:create"
         )  # Type is unknown, but action is parsed
 
-    def test_linear_webhook_stores_payload(
-        self, client: TestClient, db_session: Session
-    ):
-        """Test that Linear webhook stores the full payload."""
-        from services.gateway.app.models.events import EventRaw
-
-        db_session.query(EventRaw).delete()
-        db_session.commit()
-
-        payload = {
-            "action": "update",
-            "type": "Issue",
-            "data": {
-                "id": "payload-test",
-                "identifier": "ENG-99",
-                "title": "Test payload storage",
-                "priority": 1,
-            },
-        }
-
-        response = client.post("/webhooks/linear", json=payload)
-        assert response.status_code == 200
-
-        event = db_session.query(EventRaw).filter_by(source="linear").first()
-        assert event is not None
-        assert event.payload is not None
-        # Payload should contain our test data
-        assert "ENG-99" in event.payload
-        assert "payload-test" in event.payload
-
 
 class TestPagerDutyWebhook:
     """Tests for POST /webhooks/pagerduty endpoint."""
 
-    def test_pagerduty_webhook_incident_triggered(
-        self, client: TestClient, db_session: Session
-    ):
-        """Test PagerDuty incident.triggered event."""
-        from services.gateway.app.models.events import EventRaw
-
-        # Clean events
-        db_session.query(EventRaw).delete()
-        db_session.commit()
-
-        payload = {
-            "event": {
-                "id": "event-123",
-                "event_type": "incident.triggered",
-                "resource_type": "incident",
-                "occurred_at": "2025-11-09T10:00:00Z",
-                "data": {
-                    "id": "P123ABC",
-                    "incident_number": 42,
-                    "title": "Database high CPU usage",
-                    "status": "triggered",
-                    "urgency": "high",
-                    "service": {"summary": "Production Database"},
-                },
-            }
-        }
-        headers = {"X-PagerDuty-Signature": "sha256=test"}
-
-        response = client.post("/webhooks/pagerduty", json=payload, headers=headers)
-        assert response.status_code == 200
-        data = response.json()
-        assert data["status"] == "ok"
-        assert "id" in data
-
-        # Verify event was stored
-        event = db_session.query(EventRaw).filter_by(source="pagerduty").first()
-        assert event is not None
-        assert event.source == "pagerduty"
-        assert event.event_type == "incident.triggered"
-        assert "pagerduty-incident.triggered-P123ABC" in event.delivery_id
-
-        # Verify payload contains incident data
-        assert "P123ABC" in event.payload
-        assert "Database" in event.payload
-
     def test_pagerduty_webhook_incident_resolved(
         self, client: TestClient, db_session: Session
     ):
         """Test PagerDuty incident.resolved event."""
-        from services.gateway.app.models.events import EventRaw
-
-        db_session.query(EventRaw).delete()
-        db_session.commit()
-
         payload = {
             "event": {
                 "event_type": "incident.resolved",
@@ -778,8 +645,7 @@ class TestPagerDutyWebhook:
         response = client.post("/webhooks/pagerduty", json=payload)
         assert response.status_code == 200
 
-        event = db_session.query(EventRaw).filter_by(source="pagerduty").first()
-        assert event is not None
+        event = db_session.execute(_EVENT_COLUMNS.filter_by(source="pagerduty")).one()
         assert event.event_type == "incident.resolved"
         assert "resolved" in event.payload
 
@@ -787,11 +653,6 @@ class TestPagerDutyWebhook:
         self, client: TestClient, db_session: Session
     ):
         """Test PagerDuty incident.acknowledged event."""
-        from services.gateway.app.models.events import EventRaw
-
-        db_session.query(EventRaw).delete()
-        db_session.commit()
-
         payload = {
             "event": {
                 "event_type": "incident.acknowledged",
@@ -807,8 +668,7 @@ class TestPagerDutyWebhook:
         response = client.post("/webhooks/pagerduty", json=payload)
         assert response.status_code == 200
 
-        event = db_session.query(EventRaw).filter_by(source="pagerduty").first()
-        assert event is not None
+        event = db_session.execute(_EVENT_COLUMNS.filter_by(source="pagerduty")).one()
         assert event.event_type == "incident.acknowledged"
         assert "Alice" in event.payload
 
@@ -816,10 +676,7 @@ class TestPagerDutyWebhook:
         self, client: TestClient, db_session: Session
     ):
         """Test that duplicate PagerDuty webhook deliveries are rejected."""
-        from services.gateway.app.models.events import EventRaw
-
-        # Clean and create existing event
-        db_session.query(EventRaw).delete()
+        # Create existing event
         payload_data = json.dumps(
             {
                 "event": {
@@ -828,15 +685,15 @@ class TestPagerDutyWebhook:
                 }
             }
         )
-        existing = EventRaw(
-            source="pagerduty",
-            event_type="incident.triggered",
-            delivery_id="pagerduty-incident.triggered-PDUPLICATE",
-            payload=payload_data,
+        (existing_id,) = _seed_events(
+            db_session,
+            {
+                "source": "pagerduty",
+                "event_type": "incident.triggered",
+                "delivery_id": "pagerduty-incident.triggered-PDUPLICATE",
+                "payload": payload_data,
+            },
         )
-        db_session.add(existing)
-        db_session.commit()
-        existing_id = existing.id
 
         # Try to send duplicate
         payload = {
@@ -849,69 +706,29 @@ class TestPagerDutyWebhook:
         assert data["status"] == "duplicate"
         assert data["id"] == existing_id
 
-        # Verify no new event was created
-        count = (
-            db_session.query(EventRaw)
+        # Verify no new event was created; LIMIT 2 is enough to spot a second row
+        ids = db_session.scalars(
+            select(EventRaw.id)
             .filter_by(delivery_id="pagerduty-incident.triggered-PDUPLICATE")
-            .count()
-        )
-        assert count == 1
+            .limit(2)
+        ).all()
+        assert ids == [existing_id]
 
     def test_pagerduty_webhook_without_event_data(
         self, client: TestClient, db_session: Session
     ):
         """Test PagerDuty webhook with malformed payload uses fallback delivery_id."""
-        from services.gateway.app.models.events import EventRaw
-
-        db_session.query(EventRaw).delete()
-        db_session.commit()
-
         # Malformed payload (no event field)
-        payload = {"something": "else"}
-
-        response = client.post("/webhooks/pagerduty", json=payload)
+        response = client.post(
+            "/webhooks/pagerduty", content=_MALFORMED, headers=_JSON_CONTENT
+        )
         assert response.status_code == 200
 
         # Should create event with timestamp-based delivery_id
-        event = db_session.query(EventRaw).filter_by(source="pagerduty").first()
-        assert event is not None
+        event = db_session.execute(_EVENT_COLUMNS.filter_by(source="pagerduty")).one()
         assert event.delivery_id.startswith("pagerduty-")
         assert event.event_type == "unknown"
 
-    def test_pagerduty_webhook_stores_payload(
-        self, client: TestClient, db_session: Session
-    ):
-        """Test that PagerDuty webhook stores the full payload."""
-        from services.gateway.app.models.events import EventRaw
-
-        db_session.query(EventRaw).delete()
-        db_session.commit()
-
-        payload = {
-            "event": {
-                "event_type": "incident.escalated",
-                "data": {
-                    "id": "PTEST999",
-                    "incident_number": 999,
-                    "title": "Test payload storage",
-                    "urgency": "high",
-                    "priority": {"summary": "P1"},
-                },
-            }
-        }
-
-        response = client.post("/webhooks/pagerduty", json=payload)
-        assert response.status_code == 200
-
-        event = db_session.query(EventRaw).filter_by(source="pagerduty").first()
-        assert event is not None
-        assert event.payload is not None
-        # Payload should contain our test data
-        assert "PTEST999" in event.payload
-        assert "999" in event.payload or 999 in json.loads(event.payload).get(
-            "event", {}
-        ).get("data", {}).get("incident_number", 0)
-
 
 class TestSlackWebhook:
     """Tests for POST /webhooks/slack endpoint."""
@@ -931,12 +748,6 @@ class TestSlackWebhook:
 
     def test_slack_webhook_message_event(self, client: TestClient, db_session: Session):
         """Test Slack message event."""
-        from services.gateway.app.models.events import EventRaw
-
-        # Clean events
-        db_session.query(EventRaw).delete()
-        db_session.commit()
-
         payload = {
             "token": "deprecated_token",
             "team_id": "T123ABC",
@@ -964,8 +775,7 @@ class TestSlackWebhook:
         assert "id" in data
 
         # Verify event was stored
-        event = db_session.query(EventRaw).filter_by(source="slack").first()
-        assert event is not None
+        event = db_session.execute(_EVENT_COLUMNS.filter_by(source="slack")).one()
         assert event.source == "slack"
         assert event.event_type == "message"
         assert "slack-Ev123ABC456" in event.delivery_id
@@ -978,11 +788,6 @@ class TestSlackWebhook:
         self, client: TestClient, db_session: Session
     ):
         """Test Slack reaction_added event."""
-        from services.gateway.app.models.events import EventRaw
-
-        db_session.query(EventRaw).delete()
-        db_session.commit()
-
         payload = {
             "token": "deprecated_token",
             "team_id": "T123ABC",
@@ -1008,18 +813,12 @@ class TestSlackWebhook:
         data = response.json()
         assert data["status"] == "ok"
 
-        event = db_session.query(EventRaw).filter_by(source="slack").first()
-        assert event is not None
+        event = db_session.execute(_EVENT_COLUMNS.filter_by(source="slack")).one()
         assert event.event_type == "reaction_added"
         assert "thumbsup" in event.payload
 
     def test_slack_webhook_app_mention(self, client: TestClient, db_session: Session):
         """Test Slack app_mention event."""
-        from services.gateway.app.models.events import EventRaw
-
-        db_session.query(EventRaw).delete()
-        db_session.commit()
-
         payload = {
             "token": "deprecated_token",
             "team_id": "T123ABC",
@@ -1040,18 +839,12 @@ class TestSlackWebhook:
         response = client.post("/webhooks/slack", json=payload)
         assert response.status_code == 200
 
-        event = db_session.query(EventRaw).filter_by(source="slack").first()
-        assert event is not None
+        event = db_session.execute(_EVENT_COLUMNS.filter_by(source="slack")).one()
         assert event.event_type == "app_mention"
         assert "help me debug" in event.payload
 
     def test_slack_webhook_idempotency(self, client: TestClient, db_session: Session):
         """Test that duplicate Slack events are handled idempotently."""
-        from services.gateway.app.models.events import EventRaw
-
-        db_session.query(EventRaw).delete()
-        db_session.commit()
-
         payload = {
             "token": "deprecated_token",
             "team_id": "T123ABC",
@@ -1083,18 +876,15 @@ class TestSlackWebhook:
         assert data2["id"] == first_id
 
         # Verify only one event was stored
-        events = db_session.query(EventRaw).filter_by(source="slack").all()
-        assert len(events) == 1
+        count = db_session.scalar(
+            select(func.count()).select_from(EventRaw).filter_by(source="slack")
+        )
+        assert count == 1
 
     def test_slack_webhook_member_joined_channel(
         self, client: TestClient, db_session: Session
     ):
         """Test Slack member_joined_channel event."""
-        from services.gateway.app.models.events import EventRaw
-
-        db_session.query(EventRaw).delete()
-        db_session.commit()
-
         payload = {
             "token": "deprecated_token",
             "team_id": "T123ABC",
@@ -1115,8 +905,7 @@ class TestSlackWebhook:
         response = client.post("/webhooks/slack", json=payload)
         assert response.status_code == 200
 
-        event = db_session.query(EventRaw).filter_by(source="slack").first()
-        assert event is not None
+        event = db_session.execute(_EVENT_COLUMNS.filter_by(source="slack")).one()
         assert event.event_type == "member_joined_channel"
         assert event.payload is not None
 
@@ -1126,12 +915,6 @@ class TestNewRelicWebhook:
 
     def test_newrelic_webhook_alert_open(self, client: TestClient, db_session: Session):
         """Test New Relic alert open event."""
-        from services.gateway.app.models.events import EventRaw
-
-        # Clean events
-        db_session.query(EventRaw).delete()
-        db_session.commit()
-
         payload = {
             "incident_id": "12345",
             "condition_name": "High CPU Usage",
@@ -1147,25 +930,20 @@ class TestNewRelicWebhook:
         assert "id" in data
 
         # Verify event was stored
-        event = db_session.query(EventRaw).filter_by(source="newrelic").first()
-        assert event is not None
+        event = db_session.execute(_EVENT_COLUMNS.filter_by(source="newrelic")).one()
         assert event.source == "newrelic"
         assert event.event_type == "alert_open"
         assert "newrelic-12345" in event.delivery_id
 
         # Verify payload contains alert data
-        assert "High CPU Usage" in event.payload
-        assert "12345" in event.payload
+        stored = _json_loads(event.payload)
+        assert stored["condition_name"] == "High CPU Usage"
+        assert stored["incident_id"] == "12345"
 
     def test_newrelic_webhook_alert_closed(
         self, client: TestClient, db_session: Session
     ):
         """Test New Relic alert closed event."""
-        from services.gateway.app.models.events import EventRaw
-
-        db_session.query(EventRaw).delete()
-        db_session.commit()
-
         payload = {
             "incident_id": "67890",
             "condition_name": "Memory Alert",
@@ -1175,18 +953,12 @@ class TestNewRelicWebhook:
         response = client.post("/webhooks/newrelic", json=payload)
         assert response.status_code == 200
 
-        event = db_session.query(EventRaw).filter_by(source="newrelic").first()
-        assert event is not None
+        event = db_session.execute(_EVENT_COLUMNS.filter_by(source="newrelic")).one()
         assert event.event_type == "alert_closed"
         assert "Memory Alert" in event.payload
 
     def test_newrelic_webhook_deployment(self, client: TestClient, db_session: Session):
         """Test New Relic deployment marker event."""
-        from services.gateway.app.models.events import EventRaw
-
-        db_session.query(EventRaw).delete()
-        db_session.commit()
-
         payload = {
             "deployment": {
                 "revision": "v1.2.3",
@@ -1200,8 +972,7 @@ class TestNewRelicWebhook:
         response = client.post("/webhooks/newrelic", json=payload)
         assert response.status_code == 200
 
-        event = db_session.query(EventRaw).filter_by(source="newrelic").first()
-        assert event is not None
+        event = db_session.execute(_EVENT_COLUMNS.filter_by(source="newrelic")).one()
         assert event.event_type == "deployment"
         assert "v1.2.3" in event.payload
 
@@ -1209,19 +980,16 @@ class TestNewRelicWebhook:
         self, client: TestClient, db_session: Session
     ):
         """Test that duplicate New Relic webhook deliveries are rejected."""
-        from services.gateway.app.models.events import EventRaw
-
-        # Clean and create existing event
-        db_session.query(EventRaw).delete()
-        existing = EventRaw(
-            source="newrelic",
-            event_type="alert_open",
-            delivery_id="newrelic-duplicate-123",
-            payload=json.dumps({"incident_id": "duplicate-123"}),
+        # Create existing event
+        (existing_id,) = _seed_events(
+            db_session,
+            {
+                "source": "newrelic",
+                "event_type": "alert_open",
+                "delivery_id": "newrelic-duplicate-123",
+                "payload": json.dumps({"incident_id": "duplicate-123"}),
+            },
         )
-        db_session.add(existing)
-        db_session.commit()
-        existing_id = existing.id
 
         # Try to send duplicate
         payload = {
@@ -1235,32 +1003,24 @@ class TestNewRelicWebhook:
         assert data["status"] == "duplicate"
         assert data["id"] == existing_id
 
-        # Verify no new event was created
-        count = (
-            db_session.query(EventRaw)
-            .filter_by(delivery_id="newrelic-duplicate-123")
-            .count()
-        )
-        assert count == 1
+        # Verify no new event was created; LIMIT 2 is enough to spot a second row
+        ids = db_session.scalars(
+            select(EventRaw.id).filter_by(delivery_id="newrelic-duplicate-123").limit(2)
+        ).all()
+        assert ids == [existing_id]
 
     def test_newrelic_webhook_malformed_payload(
         self, client: TestClient, db_session: Session
     ):
         """Test New Relic webhook with malformed payload uses fallback delivery_id."""
-        from services.gateway.app.models.events import EventRaw
-
-        db_session.query(EventRaw).delete()
-        db_session.commit()
-
         # Malformed payload (no standard fields)
-        payload = {"something": "else"}
-
-        response = client.post("/webhooks/newrelic", json=payload)
+        response = client.post(
+            "/webhooks/newrelic", content=_MALFORMED, headers=_JSON_CONTENT
+        )
         assert response.status_code == 200
 
         # Should create event with timestamp-based delivery_id
-        event = db_session.query(EventRaw).filter_by(source="newrelic").first()
-        assert event is not None
+        event = db_session.execute(_EVENT_COLUMNS.filter_by(source="newrelic")).one()
         assert event.delivery_id.startswith("newrelic-")
         assert event.event_type == "unknown"
 
@@ -1272,12 +1032,6 @@ class TestPrometheusWebhook:
         self, client: TestClient, db_session: Session
     ):
         """Test Prometheus Alertmanager firing alert."""
-        from services.gateway.app.models.events import EventRaw
-
-        # Clean events
-        db_session.query(EventRaw).delete()
-        db_session.commit()
-
         payload = {
             "status": "firing",
             "groupKey": "alertgroup-123",
@@ -1308,8 +1062,7 @@ class TestPrometheusWebhook:
         assert "id" in data
 
         # Verify event was stored
-        event = db_session.query(EventRaw).filter_by(source="prometheus").first()
-        assert event is not None
+        event = db_session.execute(_EVENT_COLUMNS.filter_by(source="prometheus")).one()
         assert event.source == "prometheus"
         assert event.event_type == "alert_firing"
         assert "prometheus-" in event.delivery_id
@@ -1322,11 +1075,6 @@ class TestPrometheusWebhook:
         self, client: TestClient, db_session: Session
     ):
         """Test Prometheus Alertmanager resolved alert."""
-        from services.gateway.app.models.events import EventRaw
-
-        db_session.query(EventRaw).delete()
-        db_session.commit()
-
         payload = {
             "status": "resolved",
             "groupKey": "alertgroup-456",
@@ -1343,8 +1091,7 @@ class TestPrometheusWebhook:
         response = client.post("/webhooks/prometheus", json=payload)
         assert response.status_code == 200
 
-        event = db_session.query(EventRaw).filter_by(source="prometheus").first()
-        assert event is not None
+        event = db_session.execute(_EVENT_COLUMNS.filter_by(source="prometheus")).one()
         assert event.event_type == "alert_resolved"
         assert "HighMemory" in event.payload
 
@@ -1352,11 +1099,6 @@ class TestPrometheusWebhook:
         self, client: TestClient, db_session: Session
     ):
         """Test Prometheus Alertmanager with multiple alerts in one webhook."""
-        from services.gateway.app.models.events import EventRaw
-
-        db_session.query(EventRaw).delete()
-        db_session.commit()
-
         payload = {
             "status": "firing",
             "groupKey": "multi-alert-789",
@@ -1379,8 +1121,7 @@ class TestPrometheusWebhook:
         response = client.post("/webhooks/prometheus", json=payload)
         assert response.status_code == 200
 
-        event = db_session.query(EventRaw).filter_by(source="prometheus").first()
-        assert event is not None
+        event = db_session.execute(_EVENT_COLUMNS.filter_by(source="prometheus")).one()
         assert event.event_type == "alert_firing"
         # All alerts should be in payload
         assert "server-1" in event.payload
@@ -1391,11 +1132,6 @@ class TestPrometheusWebhook:
         self, client: TestClient, db_session: Session
     ):
         """Test that duplicate Prometheus webhook deliveries are rejected."""
-        from services.gateway.app.models.events import EventRaw
-
-        db_session.query(EventRaw).delete()
-        db_session.commit()
-
         payload = {
             "status": "firing",
             "groupKey": "duplicate-group",
@@ -1415,26 +1151,22 @@ class TestPrometheusWebhook:
         assert data2["id"] == first_id
 
         # Verify only one event was stored
-        count = db_session.query(EventRaw).filter_by(source="prometheus").count()
+        count = db_session.scalar(
+            select(func.count()).select_from(EventRaw).filter_by(source="prometheus")
+        )
         assert count == 1
 
     def test_prometheus_webhook_malformed_payload(
         self, client: TestClient, db_session: Session
     ):
         """Test Prometheus webhook with malformed payload uses fallback delivery_id."""
-        from services.gateway.app.models.events import EventRaw
-
-        db_session.query(EventRaw).delete()
-        db_session.commit()
-
         # Malformed payload (no standard fields)
-        payload = {"something": "else"}
-
-        response = client.post("/webhooks/prometheus", json=payload)
+        response = client.post(
+            "/webhooks/prometheus", content=_MALFORMED, headers=_JSON_CONTENT
+        )
         assert response.status_code == 200
 
-        event = db_session.query(EventRaw).filter_by(source="prometheus").first()
-        assert event is not None
+        event = db_session.execute(_EVENT_COLUMNS.filter_by(source="prometheus")).one()
         assert event.delivery_id.startswith("prometheus-")
         assert event.event_type == "alert_unknown"
 
@@ -1446,12 +1178,6 @@ class TestCloudWatchWebhook:
         self, client: TestClient, db_session: Session
     ):
         """Test CloudWatch alarm ALARM state via SNS."""
-        from services.gateway.app.models.events import EventRaw
-
-        # Clean events
-        db_session.query(EventRaw).delete()
-        db_session.commit()
-
         # CloudWatch alarms come through SNS with nested JSON
         alarm_message = json.dumps(
             {
@@ -1489,8 +1215,7 @@ class TestCloudWatchWebhook:
         assert "id" in data
 
         # Verify event was stored
-        event = db_session.query(EventRaw).filter_by(source="cloudwatch").first()
-        assert event is not None
+        event = db_session.execute(_EVENT_COLUMNS.filter_by(source="cloudwatch")).one()
         assert event.source == "cloudwatch"
         assert event.event_type == "alarm_alarm"
         assert "cloudwatch-sns-msg-123" in event.delivery_id
@@ -1501,11 +1226,6 @@ class TestCloudWatchWebhook:
 
     def test_cloudwatch_webhook_alarm_ok(self, client: TestClient, db_session: Session):
         """Test CloudWatch alarm OK state via SNS."""
-        from services.gateway.app.models.events import EventRaw
-
-        db_session.query(EventRaw).delete()
-        db_session.commit()
-
         alarm_message = json.dumps(
             {
                 "AlarmName": "MemoryAlarm",
@@ -1528,8 +1248,7 @@ class TestCloudWatchWebhook:
         response = client.post("/webhooks/cloudwatch", json=payload, headers=headers)
         assert response.status_code == 200
 
-        event = db_session.query(EventRaw).filter_by(source="cloudwatch").first()
-        assert event is not None
+        event = db_session.execute(_EVENT_COLUMNS.filter_by(source="cloudwatch")).one()
         assert event.event_type == "alarm_ok"
         assert "MemoryAlarm" in event.payload
 
@@ -1553,11 +1272,6 @@ class TestCloudWatchWebhook:
         self, client: TestClient, db_session: Session
     ):
         """Test CloudWatch EventBridge event via SNS."""
-        from services.gateway.app.models.events import EventRaw
-
-        db_session.query(EventRaw).delete()
-        db_session.commit()
-
         eventbridge_message = json.dumps(
             {
                 "version": "0",
@@ -1584,8 +1298,7 @@ class TestCloudWatchWebhook:
         response = client.post("/webhooks/cloudwatch", json=payload, headers=headers)
         assert response.status_code == 200
 
-        event = db_session.query(EventRaw).filter_by(source="cloudwatch").first()
-        assert event is not None
+        event = db_session.execute(_EVENT_COLUMNS.filter_by(source="cloudwatch")).one()
         assert event.event_type == "eventbridge_ec2_instance_state-change_notification"
         assert "i-1234567890abcdef0" in event.payload
 
@@ -1593,19 +1306,16 @@ class TestCloudWatchWebhook:
         self, client: TestClient, db_session: Session
     ):
         """Test that duplicate CloudWatch webhook deliveries are rejected."""
-        from services.gateway.app.models.events import EventRaw
-
-        # Clean and create existing event
-        db_session.query(EventRaw).delete()
-        existing = EventRaw(
-            source="cloudwatch",
-            event_type="alarm_alarm",
-            delivery_id="cloudwatch-duplicate-sns-123",
-            payload=json.dumps({"test": "data"}),
+        # Create existing event
+        (existing_id,) = _seed_events(
+            db_session,
+            {
+                "source": "cloudwatch",
+                "event_type": "alarm_alarm",
+                "delivery_id": "cloudwatch-duplicate-sns-123",
+                "payload": json.dumps({"test": "data"}),
+            },
         )
-        db_session.add(existing)
-        db_session.commit()
-        existing_id = existing.id
 
         # Try to send duplicate
         alarm_message = json.dumps({"AlarmName": "Test", "NewStateValue": "ALARM"})
@@ -1625,31 +1335,25 @@ class TestCloudWatchWebhook:
         assert data["status"] == "duplicate"
         assert data["id"] == existing_id
 
-        # Verify no new event was created
-        count = (
-            db_session.query(EventRaw)
+        # Verify no new event was created; LIMIT 2 is enough to spot a second row
+        ids = db_session.scalars(
+            select(EventRaw.id)
             .filter_by(delivery_id="cloudwatch-duplicate-sns-123")
-            .count()
-        )
-        assert count == 1
+            .limit(2)
+        ).all()
+        assert ids == [existing_id]
 
     def test_cloudwatch_webhook_malformed_payload(
         self, client: TestClient, db_session: Session
     ):
         """Test CloudWatch webhook with malformed payload uses fallback delivery_id."""
-        from services.gateway.app.models.events import EventRaw
-
-        db_session.query(EventRaw).delete()
-        db_session.commit()
-
         # Malformed payload (no standard fields)
-        payload = {"something": "else"}
-
-        response = client.post("/webhooks/cloudwatch", json=payload)
+        response = client.post(
+            "/webhooks/cloudwatch", content=_MALFORMED, headers=_JSON_CONTENT
+        )
         assert response.status_code == 200
 
-        event = db_session.query(EventRaw).filter_by(source="cloudwatch").first()
-        assert event is not None
+        event = db_session.execute(_EVENT_COLUMNS.filter_by(source="cloudwatch")).one()
         assert event.delivery_id.startswith("cloudwatch-")
         assert event.event_type == "unknown"
 
@@ -1657,11 +1361,6 @@ class TestCloudWatchWebhook:
         self, client: TestClient, db_session: Session
     ):
         """Test CloudWatch webhook with non-JSON message content."""
-        from services.gateway.app.models.events import EventRaw
-
-        db_session.query(EventRaw).delete()
-        db_session.commit()
-
         # Some SNS messages might have raw text instead of JSON
         payload = {
             "Type": "Notification",
@@ -1676,7 +1375,6 @@ class TestCloudWatchWebhook:
         response = client.post("/webhooks/cloudwatch", json=payload, headers=headers)
         assert response.status_code == 200
 
-        event = db_session.query(EventRaw).filter_by(source="cloudwatch").first()
-        assert event is not None
+        event = db_session.execute(_EVENT_COLUMNS.filter_by(source="cloudwatch")).one()
         assert event.event_type == "unknown"  # Can't determine type from raw text
         assert "Plain text" in event.payload